@@ -2,19 +2,12 @@ import json
 import os
 import time
 import argparse
-import requests
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from docx import Document
 import tempfile
-from supabase import create_client
 import threading
 from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from documents import parse_document
 import queue
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
 # Configuration
 SUPABASE_URL = "https://cjftrualbdceboadyieg.supabase.co"
@@ -32,8 +25,13 @@ EXTERNAL_PASSWORD = "PASSWORD"
 INDEED_EMAIL = "EMAIL"
 INDEED_PASSWORD = "PASSWORD"
 
-# Initialize Supabase client
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Initialize Supabase client on first use; Selenium is likewise imported
+# only by the functions that drive a browser
+@lru_cache(maxsize=None)
+def get_supabase():
+    from supabase import create_client
+
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
 
 # Create a queue for thread-safe printing
 print_queue = queue.Queue()
@@ -66,7 +64,7 @@ def print_worker():
 def fetch_job_details():
     """Fetch all job details from the 'jobs' table in Supabase"""
     try:
-        res = supabase.table('jobs').select('*').execute()
+        res = get_supabase().table('jobs').select('*').execute()
         if res.data:
             jobs = []
             for job in res.data:
@@ -87,7 +85,7 @@ def download_customized_resume(resume_id, job_id):
     """Download the customized resume from Supabase storage bucket 'customizedresumes' using resume_id and job_id"""
     try:
         file_path = f"enhanced_{resume_id}_{job_id}.docx"
-        file_content = supabase.storage.from_('customizedresumes').download(file_path)
+        file_content = get_supabase().storage.from_('customizedresumes').download(file_path)
         temp_dir = tempfile.gettempdir()
         local_path = os.path.join(temp_dir, f"enhanced_{resume_id}_{job_id}.docx")
         with open(local_path, 'wb') as f:
@@ -105,7 +103,8 @@ def extract_resume_info(resume_path):
     Fields: name, email, phone, address, education, experience, skills
     If a field is not found, leave it as an empty string.
     """
-    doc = Document(resume_path)
+    with open(resume_path, 'rb') as f:
+        parsed = parse_document(f.read())
     info = {
         "name": "",
         "email": "",
@@ -121,8 +120,8 @@ def extract_resume_info(resume_path):
     current_section = None
     section_text = []
 
-    for para in doc.paragraphs:
-        text = para.text.strip()
+    for block in parsed.blocks:
+        text = block.text.strip()
         if not text:
             continue
         
@@ -171,6 +170,8 @@ def extract_resume_info(resume_path):
 
 def try_fill_field(driver, field_name, value, field_type="text"):
     """Try to fill a form field with the given value"""
+    from selenium.webdriver.common.by import By
+
     if not value:
         return False
     try:
@@ -201,6 +202,8 @@ def try_fill_field(driver, field_name, value, field_type="text"):
         return False
 
 def linkedin_login(driver, email, password):
+    from selenium.webdriver.common.by import By
+
     driver.get("https://www.linkedin.com/login")
     time.sleep(2)
     email_input = driver.find_element(By.ID, "username")
@@ -213,6 +216,8 @@ def linkedin_login(driver, email, password):
     time.sleep(3)
 
 def check_login_status(driver):
+    from selenium.webdriver.common.by import By
+
     try:
         # Check for common elements that indicate we're logged in
         if "linkedin.com" in driver.current_url:
@@ -238,6 +243,8 @@ def check_login_status(driver):
 
 def handle_external_website(driver, company):
     """Handle application on external company websites"""
+    from selenium.webdriver.common.by import By
+
     try:
         print(f"Detected external website for {company}")
         take_debug_screenshot(driver, f"external_website_{company}")
@@ -326,6 +333,13 @@ def handle_external_website(driver, company):
         return False
 
 def apply_to_job(job_link, resume_path, company, title):
+    from selenium import webdriver
+    from selenium.common.exceptions import NoSuchElementException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
     # Enhanced Chrome options
     options = Options()
     options.add_argument("--start-maximized")
@@ -0,0 +1,485 @@
+"""Microbenchmarks for the backend scripts.
+
+Run from src/backend, e.g.: python bench.py match --tokens 5000
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+
+# Cumulative import time allowed per module (ms). Importing a module must not
+# load spaCy, SciPy, Supabase, Gemini, PyMuPDF or Selenium; those load on first use.
+IMPORT_BUDGET_MS = {
+    "scrape": 400,
+    "extraction": 400,
+    "customize": 150,
+    "jsearch": 150,
+    "apply": 150,
+}
+
+def best_of(fn, repeat):
+    """Run fn repeat times and return (best wall time in seconds, last result)"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def synthetic_description(vocab_words, n_tokens, rng):
+    """Build a job-description-like text of roughly n_tokens words"""
+    return " ".join(rng.choice(vocab_words) for _ in range(n_tokens))
+
+def sample_vocab_words(nlp, rng, n=20000):
+    """Alphabetic words that have a static vector in the model"""
+    strings = nlp.vocab.strings
+    keys = list(nlp.vocab.vectors.keys())
+    return [
+        strings[key] for key in rng.sample(keys, min(len(keys), n))
+        if key in strings and strings[key].isalpha()
+    ]
+
+def match_skills_spacy(text, skills):
+    """The original per-token similarity loop, kept as the bench_match baseline"""
+    import scrape
+
+    text_doc = scrape.get_nlp()(text.lower())
+    skill_docs = [scrape.skill_entry(skill).doc for skill in skills]
+    matched = set()
+
+    for skill, skill_doc in zip(skills, skill_docs):
+        if skill.lower() in text.lower():
+            matched.add(skill)
+            continue
+
+        for token in text_doc:
+            if token.similarity(skill_doc) > scrape.SIMILARITY_THRESHOLD:
+                matched.add(skill)
+                break
+
+        if len(skill.split()) == 1 and len(skill) <= 4:
+            for token in text_doc:
+                if token.text == skill.lower() and any(
+                    word.lower().startswith(skill.lower()) 
+                    for word in skills if word != skill
+                ):
+                    matched.add(skill)
+                    break
+    return matched
+
+def _orth_vectors(orths):
+    """Look up static vectors for an array of orth ids (zero rows when missing)"""
+    import numpy as np
+    import scrape
+
+    vectors = scrape.get_nlp().vocab.vectors
+    rows = np.asarray(vectors.find(keys=[int(orth) for orth in orths]), dtype="i")
+    table = np.asarray(vectors.data)
+    matrix = np.zeros((len(rows), table.shape[1]), dtype=table.dtype)
+    found = rows >= 0
+    matrix[found] = table[rows[found]]
+    return matrix
+
+def match_skills_vectorized(text, skills):
+    """Same matches as match_skills_spacy, with one matrix product per job.
+
+    Every unique description token and every resume skill is turned into a
+    unit vector, so a single (skills x tokens) product gives all the cosine
+    similarities that match_skills_spacy computes one Python call at a time.
+    Only the tokenizer runs: the tagger/parser/NER output was never used.
+    The short-skill pass of match_skills_spacy needs token.text == skill,
+    which the substring check below already covers.
+    """
+    import numpy as np
+    import scrape
+    from spacy.attrs import ORTH
+
+    lowered = text.lower()
+    matched = {skill for skill in skills if skill.lower() in lowered}
+    pending = [skill for skill in skills if skill not in matched]
+    if not pending:
+        return matched
+
+    text_doc = scrape.get_nlp().make_doc(lowered)
+    token_matrix = scrape._unit_rows(_orth_vectors(np.unique(text_doc.to_array(ORTH))))
+    skill_matrix = scrape._unit_rows(np.vstack([scrape.skill_entry(skill).vector for skill in pending]))
+
+    scores = skill_matrix @ token_matrix.T
+    hits = (scores > scrape.SIMILARITY_THRESHOLD).any(axis=1)
+    matched.update(skill for skill, hit in zip(pending, hits) if hit)
+    return matched
+
+def bench_match(args):
+    """Compare the original token-loop skill matcher with the vectorized one"""
+    import scrape
+
+    rng = random.Random(args.seed)
+    vocab_words = sample_vocab_words(scrape.get_nlp(), rng)
+    skills = [
+        "Python", "Java", "SQL", "AWS", "Docker", "React", "Machine Learning",
+        "Data Analysis", "Git", "TensorFlow", "Kubernetes", "Flask", "Django",
+        "Node.js", "C++", "Figma", "PostgreSQL", "Pandas", "NumPy", "Go",
+    ][:args.skills]
+    text = synthetic_description(vocab_words, args.tokens, rng)
+
+    loop_time, loop_matched = best_of(lambda: match_skills_spacy(text, skills), args.repeat)
+    vec_time, vec_matched = best_of(lambda: match_skills_vectorized(text, skills), args.repeat)
+
+    print(f"tokens={args.tokens} skills={len(skills)}")
+    print(f"match_skills_spacy      {loop_time * 1000:10.1f} ms")
+    print(f"match_skills_vectorized {vec_time * 1000:10.1f} ms  ({loop_time / vec_time:.1f}x)")
+    print(f"same matches: {loop_matched == vec_matched} ({sorted(vec_matched)})")
+
+def bench_pipe(args):
+    """Docs/sec of per-description nlp() calls vs batched, trimmed nlp.pipe"""
+    import scrape
+
+    rng = random.Random(args.seed)
+    vocab_words = sample_vocab_words(scrape.get_nlp(), rng)
+    texts = [synthetic_description(vocab_words, args.tokens, rng) for _ in range(args.docs)]
+
+    before, _ = best_of(lambda: [scrape.get_nlp()(text.lower()) for text in texts], args.repeat)
+    after, _ = best_of(
+        lambda: scrape.parse_descriptions(texts, batch_size=args.batch_size, n_process=args.n_process),
+        args.repeat
+    )
+
+    print(f"docs={args.docs} tokens/doc={args.tokens}")
+    print(f"nlp() per description     {args.docs / before:10.1f} docs/sec")
+    print(f"parse_descriptions (pipe) {args.docs / after:10.1f} docs/sec  ({before / after:.1f}x)")
+
+def load_resume_texts(corpus):
+    """Text of every .pdf/.docx/.txt resume in a directory"""
+    import extraction
+
+    texts = []
+    for name in sorted(os.listdir(corpus)):
+        path = os.path.join(corpus, name)
+        ext = name.rsplit(".", 1)[-1].lower()
+        if ext not in ("pdf", "docx", "txt"):
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        texts.append(data.decode("utf-8", "ignore") if ext == "txt"
+                     else extraction.extract_resume_text(ext, data))
+    return texts
+
+def bench_extract(args):
+    """Docs/sec and skills-found parity of the extract_skills modes"""
+    import extraction
+
+    texts = load_resume_texts(args.corpus)
+    if not texts:
+        raise SystemExit(f"No .pdf/.docx/.txt resumes in {args.corpus}")
+
+    results = {}
+    print(f"resumes={len(texts)}")
+    for mode in ("legacy", "full", "fast"):
+        seconds, found = best_of(
+            lambda: [set(extraction.extract_skills(text, mode)) for text in texts], args.repeat
+        )
+        results[mode] = found
+        print(f"{mode:7s} {len(texts) / seconds:10.1f} docs/sec")
+
+    reference = results["legacy"]
+    for mode in ("full", "fast"):
+        same = sum(a == b for a, b in zip(results[mode], reference))
+        missing = sum(len(b - a) for a, b in zip(results[mode], reference))
+        extra = sum(len(a - b) for a, b in zip(results[mode], reference))
+        print(f"{mode} vs legacy: {same}/{len(texts)} identical, {missing} skills missing, {extra} extra")
+
+def bench_parse(args):
+    """Latency of every installed parsing backend per document, against page count"""
+    from documents import available_backends, detect_type, parse_document
+
+    files = []
+    for name in sorted(os.listdir(args.corpus)):
+        if name.lower().endswith((".pdf", ".docx")):
+            with open(os.path.join(args.corpus, name), "rb") as f:
+                files.append((name, f.read()))
+    if not files:
+        raise SystemExit(f"No .pdf/.docx documents in {args.corpus}")
+
+    per_page = {}
+    print(f"{'document':32s} {'pages':>5s}  {'backend':12s} {'ms':>9s}  {'ms/page':>8s}  same text")
+    for name, content in files:
+        file_type = detect_type(content)
+        reference = None
+        for backend in available_backends(file_type):
+            seconds, parsed = best_of(
+                lambda: parse_document(content, backend=backend), args.repeat
+            )
+            reference = parsed.text if reference is None else reference
+            ms = seconds * 1000
+            per_page.setdefault((file_type, backend), []).append(ms / max(parsed.pages, 1))
+            print(f"{name[:32]:32s} {parsed.pages:5d}  {backend:12s} {ms:9.1f}  "
+                  f"{ms / max(parsed.pages, 1):8.1f}  {parsed.text == reference}")
+
+    print()
+    for (file_type, backend), values in sorted(per_page.items()):
+        print(f"{file_type:5s} {backend:12s} {sum(values) / len(values):8.1f} ms/page (mean of {len(values)})")
+
+def bench_llm(args):
+    """Customization throughput against fake_llm.py: serial + sleep vs LLMScheduler threads"""
+    import json
+    import urllib.request
+    from concurrent.futures import ThreadPoolExecutor
+    from fake_llm import FakeLLMServer
+    from llm_scheduler import LLMScheduler, estimate_tokens
+
+    server = FakeLLMServer(port=0, rpm=args.server_rpm, tpm=args.server_tpm, latency=args.latency).start()
+    url = f"{server.url}/v1beta/models/fake:generateContent"
+    rng = random.Random(args.seed)
+    resume = " ".join(rng.choice(["python", "sql", "docker", "led", "teams", "built"]) for _ in range(args.tokens))
+    prompt = f"JOB DESCRIPTION:\n...\nRESUME (MAKE MINIMAL CHANGES TO THIS EXACT STRUCTURE):\n{resume}\nINSTRUCTIONS:"
+
+    def generate():
+        body = json.dumps({"contents": [{"parts": [{"text": prompt}]}]}).encode("utf-8")
+        request = urllib.request.Request(url, body, {"Content-Type": "application/json"})
+        with urllib.request.urlopen(request) as response:
+            return json.load(response)
+
+    try:
+        if args.baseline:
+            start = time.perf_counter()
+            for _ in range(args.requests):
+                generate()
+                time.sleep(1.1)
+            serial = time.perf_counter() - start
+            print(f"serial + sleep(1.1)  {serial:7.1f}s  {args.requests / serial * 60:7.1f} req/min")
+
+        server.rejected = 0
+        scheduler = LLMScheduler(args.rpm, args.tpm, backoff=1.0)
+        tokens = estimate_tokens(prompt) + estimate_tokens(resume)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            list(pool.map(lambda _: scheduler.call(
+                generate, tokens, usage=lambda r: r["usageMetadata"]["totalTokenCount"]
+            ), range(args.requests)))
+        elapsed = time.perf_counter() - start
+        stats = scheduler.stats()
+        print(f"scheduler x{args.workers:<3d}     {elapsed:7.1f}s  {args.requests / elapsed * 60:7.1f} req/min  "
+              f"({stats['quota_errors']} quota errors, server rejected {server.rejected})")
+    finally:
+        server.stop()
+
+def bench_sections(args):
+    """Estimated Gemini tokens to customize each resume for --jobs jobs: whole-resume
+    prompts vs editable sections only vs sections batched --batch-size jobs per request"""
+    import customize
+    from documents import join_sections, parse_document
+    from llm_scheduler import estimate_tokens
+
+    rng = random.Random(args.seed)
+    vocab = ["python", "sql", "cloud", "teams", "deliver", "data", "pipelines", "stakeholders"]
+    job_descs = [synthetic_description(vocab, args.job_words, rng)[:customize.JOB_DESC_CHAR_LIMIT]
+                 for _ in range(args.jobs)]
+    modes = ("full", "sections", "batched")
+    totals = {mode: [0, 0, 0] for mode in modes}  # requests, tokens in, tokens out
+    print(f"{'resume':32s} " + " ".join(f"{mode + ' req/in/out':>22s}" for mode in modes) + "  editable")
+    for name in sorted(os.listdir(args.corpus)):
+        if not name.lower().endswith((".pdf", ".docx")):
+            continue
+        with open(os.path.join(args.corpus, name), "rb") as f:
+            sections = parse_document(f.read(), cache=False).sections()
+        resume_text = join_sections(sections)[:customize.RESUME_CHAR_LIMIT]
+        editable = customize.editable_sections(sections)
+        counts = {mode: [0, 0, 0] for mode in modes}
+
+        def add(mode, prompt, output_tokens):
+            counts[mode][0] += 1
+            counts[mode][1] += estimate_tokens(prompt)
+            counts[mode][2] += output_tokens
+
+        section_tokens = sum(estimate_tokens(section.text) for section in editable)
+        for job_desc in job_descs:
+            add("full", customize.full_prompt(resume_text, job_desc), estimate_tokens(resume_text))
+            if editable:
+                add("sections", customize.section_prompt(editable, job_desc), section_tokens)
+            else:
+                add("sections", customize.full_prompt(resume_text, job_desc), estimate_tokens(resume_text))
+        for start in range(0, len(job_descs), args.batch_size):
+            batch = job_descs[start:start + args.batch_size]
+            if editable and len(batch) > 1:
+                add("batched", customize.batch_prompt(editable, batch), len(batch) * section_tokens)
+            elif editable:
+                add("batched", customize.section_prompt(editable, batch[0]), section_tokens)
+            else:
+                for job_desc in batch:
+                    add("batched", customize.full_prompt(resume_text, job_desc), estimate_tokens(resume_text))
+
+        for mode in modes:
+            totals[mode] = [total + count for total, count in zip(totals[mode], counts[mode])]
+        print(f"{name[:32]:32s} " + " ".join(f"{'/'.join(map(str, counts[mode])):>22s}" for mode in modes)
+              + f"  {', '.join(section.heading for section in editable) or '(none, whole resume)'}")
+
+    full_tokens = totals["full"][1] + totals["full"][2]
+    if full_tokens:
+        print()
+        for mode in modes:
+            requests, tokens_in, tokens_out = totals[mode]
+            print(f"{mode:9s} {requests:5d} requests  {tokens_in:8d} in  {tokens_out:7d} out  "
+                  f"({full_tokens / (tokens_in + tokens_out):.1f}x fewer tokens than full)")
+
+def proportional_memory_mb():
+    """(Rss, Pss) of this process in MB; Pss splits shared pages between their users"""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in ("Rss", "Pss"):
+                values[name] = int(rest.split()[0]) / 1024
+    return values["Rss"], values["Pss"]
+
+def _vector_worker(model, shared, barrier, results):
+    import numpy as np
+
+    if shared:
+        from vector_store import load_shared_model
+        nlp = load_shared_model(model)
+    else:
+        import spacy
+        nlp = spacy.load(model)
+    # Touch every page of the table, as a matching run over many jobs would
+    float(np.asarray(nlp.vocab.vectors.data).sum())
+    barrier.wait()
+    results.put(proportional_memory_mb())
+    barrier.wait()
+
+def bench_vectors(args):
+    """Total memory of N worker processes with private vs shared vector tables"""
+    import multiprocessing
+
+    from vector_store import load_shared_model
+    load_shared_model(args.model)  # Export once up front
+
+    ctx = multiprocessing.get_context("spawn")
+    for shared in (False, True):
+        barrier = ctx.Barrier(args.workers)
+        results = ctx.Queue()
+        workers = [
+            ctx.Process(target=_vector_worker, args=(args.model, shared, barrier, results))
+            for _ in range(args.workers)
+        ]
+        for worker in workers:
+            worker.start()
+        usage = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+        rss = sum(r for r, _ in usage)
+        pss = sum(p for _, p in usage)
+        label = "shared (mmap)" if shared else "private copy"
+        print(f"{label:14s} workers={args.workers}  Rss {rss:8.0f} MB  Pss {pss:8.0f} MB")
+
+def import_times(module):
+    """(module's cumulative import time in ms, [(ms, name)] of its heaviest imports)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr}")
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((depth, int(cumulative) / 1000, name.strip()))
+    # Children are listed just before their parent, one level deeper; lines
+    # ahead of the module's subtree are interpreter startup (site etc.)
+    end = next(i for i, (depth, _, name) in enumerate(imports) if depth == 0 and name == module)
+    start = end
+    while start > 0 and imports[start - 1][0] > 0:
+        start -= 1
+    total = imports[end][1]
+    heaviest = sorted(((ms, name) for _, ms, name in imports[start:end]), reverse=True)
+    return total, heaviest
+
+def bench_importtime(args):
+    """Import time of each backend module against IMPORT_BUDGET_MS"""
+    over = []
+    for module in args.modules or sorted(IMPORT_BUDGET_MS):
+        runs = [import_times(module) for _ in range(args.repeat)]
+        total, heaviest = min(runs)
+        budget = IMPORT_BUDGET_MS.get(module)
+        status = "" if budget is None else ("ok" if total <= budget else "OVER BUDGET")
+        print(f"{module:12s} {total:8.1f} ms  (budget {budget} ms) {status}")
+        for ms, name in heaviest[:args.top]:
+            print(f"    {ms:8.1f} ms  {name}")
+        if budget is not None and total > budget:
+            over.append(module)
+    if over:
+        raise SystemExit(f"Import time over budget: {', '.join(over)}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    match = sub.add_parser("match", help="skill matcher: token loop vs matrix product")
+    match.add_argument("--tokens", type=int, default=5000)
+    match.add_argument("--skills", type=int, default=20)
+    match.add_argument("--repeat", type=int, default=3)
+    match.add_argument("--seed", type=int, default=0)
+    match.set_defaults(func=bench_match)
+
+    pipe = sub.add_parser("pipe", help="description parsing: nlp() per doc vs batched nlp.pipe")
+    pipe.add_argument("--docs", type=int, default=200)
+    pipe.add_argument("--tokens", type=int, default=500)
+    pipe.add_argument("--batch-size", type=int, default=64)
+    pipe.add_argument("--n-process", type=int, default=1)
+    pipe.add_argument("--repeat", type=int, default=1)
+    pipe.add_argument("--seed", type=int, default=0)
+    pipe.set_defaults(func=bench_pipe)
+
+    extract = sub.add_parser("extract", help="extract_skills modes: legacy vs full vs fast")
+    extract.add_argument("corpus", help="directory of sample resumes (.pdf/.docx/.txt)")
+    extract.add_argument("--repeat", type=int, default=1)
+    extract.set_defaults(func=bench_extract)
+
+    parse = sub.add_parser("parse", help="document parsing backends: latency vs page count")
+    parse.add_argument("corpus", help="directory of sample documents (.pdf/.docx)")
+    parse.add_argument("--repeat", type=int, default=3)
+    parse.set_defaults(func=bench_parse)
+
+    llm = sub.add_parser("llm", help="Gemini-style calls against a local fake server: serial vs scheduled")
+    llm.add_argument("--requests", type=int, default=40)
+    llm.add_argument("--workers", type=int, default=8)
+    llm.add_argument("--rpm", type=int, default=100, help="client-side requests-per-minute budget")
+    llm.add_argument("--tpm", type=int, default=400000, help="client-side tokens-per-minute budget")
+    llm.add_argument("--server-rpm", type=int, default=100, help="quota the fake server enforces")
+    llm.add_argument("--server-tpm", type=int, default=400000)
+    llm.add_argument("--latency", type=float, default=1.0, help="fake server seconds per response")
+    llm.add_argument("--tokens", type=int, default=800, help="resume size in words")
+    llm.add_argument("--no-baseline", dest="baseline", action="store_false")
+    llm.add_argument("--seed", type=int, default=0)
+    llm.set_defaults(func=bench_llm)
+
+    sections = sub.add_parser("sections", help="prompt size: whole resume vs editable sections vs batched jobs")
+    sections.add_argument("corpus", help="directory of sample resumes (.pdf/.docx)")
+    sections.add_argument("--jobs", type=int, default=4, help="matched jobs per resume")
+    sections.add_argument("--batch-size", type=int, default=4, help="jobs per batched request")
+    sections.add_argument("--job-words", type=int, default=600)
+    sections.add_argument("--seed", type=int, default=0)
+    sections.set_defaults(func=bench_sections)
+
+    vectors = sub.add_parser("vectors", help="worker memory: private vs mmap-shared vector tables")
+    vectors.add_argument("--model", default="en_core_web_md")
+    vectors.add_argument("--workers", type=int, default=8)
+    vectors.set_defaults(func=bench_vectors)
+
+    importtime = sub.add_parser("importtime", help="python -X importtime per module, checked against budgets")
+    importtime.add_argument("modules", nargs="*", help="modules to measure (default: every budgeted one)")
+    importtime.add_argument("--top", type=int, default=5, help="heaviest imports listed per module")
+    importtime.add_argument("--repeat", type=int, default=3)
+    importtime.set_defaults(func=bench_importtime)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,82 @@
 import io
-import fitz  # PyMuPDF
-from docx import Document
-from docx.shared import Pt, Inches
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-import google.generativeai as genai
-from supabase import create_client
-import requests
-import time
-import re
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from doc_store import normalize_description
+from documents import EDITABLE_HEADINGS, Section, heading_pattern, join_sections, parse_document
+from llm_cache import LLMResponseCache
+from llm_scheduler import LLMScheduler, estimate_tokens
 
 # Configuration (same as before)
 SUPABASE_URL = "SUPABASE_URL"
 SUPABASE_KEY = "SUPABASE_KEY"
 GEMINI_API_KEY = "GOOGLE_API_KEY"
 MODEL_NAME = "models/gemini-1.5-pro-latest"
+GEMINI_API_ENDPOINT = None  # e.g. "http://127.0.0.1:8090" for fake_llm.py
 
-# Initialize clients
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-genai.configure(api_key=GEMINI_API_KEY)
-
-def extract_pdf_structure(pdf_bytes):
-    """Improved PDF extraction that preserves structure"""
-    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
-        blocks = []
-        for page in doc:
-            for block in page.get_text("blocks"):
-                x0, y0, x1, y1, text, block_no, block_type = block
-                if text.strip():
-                    blocks.append({
-                        'text': text.strip(),
-                        'y_pos': y0,
-                        'is_heading': block_type == 1 or (len(text) < 30 and text.isupper())
-                    })
-        
-        # Sort by vertical position to maintain reading order
-        blocks.sort(key=lambda b: b['y_pos'])
-        return [b['text'] for b in blocks]
-
-def preserve_structure_customize(original_text, job_desc):
-    """Customization that strictly preserves structure"""
-    prompt = f"""
+# ✅ Gemini quota shared by all customization threads (set to your plan's limits)
+GEMINI_RPM = 60
+GEMINI_TPM = 1000000
+CUSTOMIZE_WORKERS = 8
+
+# ✅ Prompt inputs; bump PROMPT_VERSION whenever the prompt template changes
+PROMPT_VERSION = "2"
+GENERATION_CONFIG = {"temperature": 0.2}
+JOB_DESC_CHAR_LIMIT = 5000
+RESUME_CHAR_LIMIT = 15000
+
+# ✅ Section-level customization: only these sections go to Gemini, the rest
+# of the resume is spliced back locally. Resumes without one of them are
+# customized whole, as before. Built from the same alternatives the heading
+# detector uses, so every detected summary/skills heading is editable.
+EDITABLE_SECTION_PATTERN = heading_pattern(EDITABLE_HEADINGS)
+SECTION_GENERATION_CONFIG = dict(GENERATION_CONFIG, response_mime_type="application/json")
+
+# ✅ Jobs customized per Gemini request: a resume's editable sections are sent
+# once with up to this many job descriptions (1 = one request per job)
+JOB_BATCH_SIZE = 4
+
+# ✅ Gemini responses cached by hash of everything that determines them
+LLM_CACHE_DB = ".cache/llm_responses.sqlite3"
+LLM_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Storage bucket holding enhanced_{resume_id}_{job_id}.docx outputs
+OUTPUT_BUCKET = "customizedresumes"
+
+# Initialize clients on first use; python-docx and requests are likewise
+# imported only by the functions that need them
+@lru_cache(maxsize=None)
+def get_supabase():
+    from supabase import create_client
+
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+@lru_cache(maxsize=None)
+def get_model():
+    import google.generativeai as genai
+
+    if GEMINI_API_ENDPOINT:
+        genai.configure(api_key=GEMINI_API_KEY, transport="rest",
+                        client_options={"api_endpoint": GEMINI_API_ENDPOINT})
+    else:
+        genai.configure(api_key=GEMINI_API_KEY)
+    return genai.GenerativeModel(MODEL_NAME)
+
+@lru_cache(maxsize=None)
+def get_llm_scheduler():
+    return LLMScheduler(GEMINI_RPM, GEMINI_TPM)
+
+def billed_tokens(response):
+    usage = getattr(response, "usage_metadata", None)
+    return getattr(usage, "total_token_count", None)
+
+@lru_cache(maxsize=None)
+def get_llm_cache():
+    return LLMResponseCache(LLM_CACHE_DB, max_bytes=LLM_CACHE_MAX_BYTES)
+
+def full_prompt(resume_text, job_desc):
+    return f"""
     CUSTOMIZE THIS RESUME FOR THE JOB BELOW WHILE:
     1. PRESERVING THE EXACT ORIGINAL STRUCTURE
     2. KEEPING ALL SECTION HEADERS IN PLACE
@@ -49,10 +85,10 @@ def preserve_structure_customize(original_text, job_desc):
     5. ADD ABOUT BASED ON JOB DESCRIPTION
     
     JOB DESCRIPTION:
-    {job_desc[:5000]}
+    {job_desc}
     
     RESUME (MAKE MINIMAL CHANGES TO THIS EXACT STRUCTURE):
-    {original_text[:15000]}
+    {resume_text}
     
     INSTRUCTIONS:
     1. Only modify text content within existing sections 
@@ -65,20 +101,215 @@ def preserve_structure_customize(original_text, job_desc):
     
     RETURN THE RESUME WITH YOUR MINIMAL CHANGES IN THE EXACT SAME STRUCTURE.
     """
+
+def section_prompt(sections, job_desc):
+    """Prompt carrying only the editable sections, as a heading -> text JSON object"""
+    payload = json.dumps({section.heading: section.text for section in sections}, indent=1)
+    return f"""
+    CUSTOMIZE THESE RESUME SECTIONS FOR THE JOB BELOW.
+    
+    JOB DESCRIPTION:
+    {job_desc}
+    
+    SECTIONS (JSON, heading -> current text):
+    {payload}
+    
+    INSTRUCTIONS:
+    1. For a skills section, bold MAX 3 items matching the job
+    2. For a profile/summary/about section, rewrite to better match the job (keep same length)
+    3. Keep each section's line breaks and bullet points
+    4. Never invent employers, degrees, dates or contact details
+    
+    RETURN ONLY A JSON OBJECT WITH EXACTLY THE SAME KEYS, EACH MAPPED TO ITS NEW TEXT.
+    """
+
+def batch_prompt(sections, job_descs):
+    """Prompt carrying the editable sections once and several job descriptions"""
+    jobs = json.dumps({f"job_{i}": desc for i, desc in enumerate(job_descs, 1)}, indent=1)
+    payload = json.dumps({section.heading: section.text for section in sections}, indent=1)
+    return f"""
+    CUSTOMIZE THESE RESUME SECTIONS SEPARATELY FOR EACH JOB BELOW.
     
+    JOBS (JSON, key -> job description):
+    {jobs}
+    
+    SECTIONS (JSON, heading -> current text):
+    {payload}
+    
+    INSTRUCTIONS:
+    1. For a skills section, bold MAX 3 items matching the job
+    2. For a profile/summary/about section, rewrite to better match the job (keep same length)
+    3. Keep each section's line breaks and bullet points
+    4. Never invent employers, degrees, dates or contact details
+    5. Tailor each job's sections to that job alone
+    
+    RETURN ONLY A JSON OBJECT WITH EXACTLY THE SAME JOB KEYS, EACH MAPPED TO AN
+    OBJECT WITH EXACTLY THE SAME SECTION KEYS AS ABOVE, EACH MAPPED TO ITS NEW TEXT.
+    """
+
+def editable_sections(sections):
+    """Sections Gemini may rewrite (first occurrence of each heading)"""
+    seen = set()
+    editable = []
+    for section in sections:
+        if section.heading not in seen and EDITABLE_SECTION_PATTERN.match(section.heading):
+            seen.add(section.heading)
+            editable.append(section)
+    return editable
+
+def generate(prompt, cache_inputs, output_tokens, use_cache=True, scheduler=None,
+             generation_config=GENERATION_CONFIG, accept=bool):
+    """Gemini response text for prompt, from the response cache when possible.
+
+    cache_inputs are everything besides the template that determines the
+    prompt; output_tokens is the expected response size for the TPM budget.
+    Only responses for which accept(text) is true are cached, so one bad
+    answer is retried next run instead of being replayed forever.
+    """
+    if use_cache:
+        cache_key = LLMResponseCache.key(PROMPT_VERSION, MODEL_NAME, generation_config, *cache_inputs)
+        cached = get_llm_cache().get(cache_key)
+        if cached is not None:
+            if accept(cached):
+                return cached
+            get_llm_cache().delete(cache_key)
+
+    response = (scheduler or get_llm_scheduler()).call(
+        lambda: get_model().generate_content(prompt, generation_config=generation_config),
+        estimate_tokens(prompt) + output_tokens,
+        usage=billed_tokens
+    )
+    if use_cache and accept(response.text):
+        get_llm_cache().put(cache_key, PROMPT_VERSION, MODEL_NAME, response.text)
+    return response.text
+
+def preserve_structure_customize(original_text, job_desc, use_cache=True, scheduler=None):
+    """Customization that strictly preserves structure (safe to call from many threads).
+
+    Gemini errors propagate, so an uncustomized resume is never uploaded as
+    if it were customized.
+    """
+    job_desc = job_desc[:JOB_DESC_CHAR_LIMIT]
+    resume_text = original_text[:RESUME_CHAR_LIMIT]
+    # The response is a rewrite of the resume, so count its tokens on top of the prompt's
+    return generate(
+        full_prompt(resume_text, job_desc), ("full", resume_text, job_desc),
+        estimate_tokens(resume_text), use_cache, scheduler
+    )
+
+def load_json_response(text):
+    """JSON value of a response, tolerating a ``` fence, or None"""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.strip("`").split("\n", 1)[-1]
     try:
-        model = genai.GenerativeModel(MODEL_NAME)
-        response = model.generate_content(
-            prompt,
-            generation_config={"temperature": 0.2}
+        return json.loads(text)
+    except ValueError:
+        return None
+
+def validate_sections(rewritten, editable):
+    """{heading: new text} from a decoded response, or None unless it has
+    non-empty text for exactly the editable sections' headings"""
+    if not isinstance(rewritten, dict):
+        return None
+    headings = {section.heading for section in editable}
+    if set(rewritten) != headings:
+        return None
+    result = {
+        heading: value.strip() for heading, value in rewritten.items()
+        if isinstance(value, str) and value.strip()
+    }
+    return result if len(result) == len(headings) else None
+
+def parse_section_response(text, editable):
+    """{heading: new text} for the editable sections found in a JSON response, or None"""
+    return validate_sections(load_json_response(text), editable)
+
+def parse_batch_response(text, editable, count):
+    """[{heading: new text} or None] for each of count jobs in a batched response.
+
+    A job's entry is None when it is missing or fails the same checks as a
+    single-job response.
+    """
+    rewritten = load_json_response(text)
+    if not isinstance(rewritten, dict):
+        return [None] * count
+    return [validate_sections(rewritten.get(f"job_{i}"), editable) for i in range(1, count + 1)]
+
+def splice_sections(sections, rewritten):
+    """Resume text with the first section of each rewritten heading replaced"""
+    spliced = []
+    done = set()
+    for section in sections:
+        if section.heading in rewritten and section.heading not in done:
+            done.add(section.heading)
+            spliced.append(Section(section.heading, rewritten[section.heading]))
+        else:
+            spliced.append(section)
+    return join_sections(spliced)
+
+def customize_sections(sections, job_desc, use_cache=True, scheduler=None):
+    """Rewrite only the editable sections and splice them back into the resume.
+
+    Falls back to whole-resume customization when the resume has no
+    editable section or the response is not usable JSON; Gemini errors
+    propagate.
+    """
+    job_desc = job_desc[:JOB_DESC_CHAR_LIMIT]
+    editable = editable_sections(sections)
+    if not editable:
+        return preserve_structure_customize(join_sections(sections), job_desc, use_cache, scheduler)
+
+    text = generate(
+        section_prompt(editable, job_desc),
+        ("sections", [list(section) for section in editable], job_desc),
+        sum(estimate_tokens(section.text) for section in editable),
+        use_cache, scheduler, SECTION_GENERATION_CONFIG,
+        accept=lambda text: parse_section_response(text, editable) is not None
+    )
+    rewritten = parse_section_response(text, editable)
+    if rewritten is None:
+        print("⚠ Section response was not JSON with the same headings, customizing the whole resume")
+        return preserve_structure_customize(join_sections(sections), job_desc, use_cache, scheduler)
+    return splice_sections(sections, rewritten)
+
+def customize_batch(sections, job_descs, use_cache=True, scheduler=None):
+    """Customized resume text for each of several jobs from one Gemini request.
+
+    The editable sections go out once with every job description and come
+    back as {job key: {heading: text}}. Entries are None for jobs that need
+    a request of their own through customize_sections: those whose entry
+    failed validation, all of them if the request failed, and every job
+    when there is only one or the resume has no editable section.
+    """
+    job_descs = [desc[:JOB_DESC_CHAR_LIMIT] for desc in job_descs]
+    editable = editable_sections(sections)
+    if len(job_descs) < 2 or not editable:
+        return [None] * len(job_descs)
+
+    try:
+        text = generate(
+            batch_prompt(editable, job_descs),
+            ("batch", [list(section) for section in editable], job_descs),
+            len(job_descs) * sum(estimate_tokens(section.text) for section in editable),
+            use_cache, scheduler, SECTION_GENERATION_CONFIG,
+            accept=lambda text: None not in parse_batch_response(text, editable, len(job_descs))
         )
-        return response.text
     except Exception as e:
-        print(f"⚠ Customization failed: {str(e)}")
-        return original_text
+        print(f"⚠ Batched customization failed, customizing jobs one by one: {str(e)}")
+        return [None] * len(job_descs)
+
+    batch = parse_batch_response(text, editable, len(job_descs))
+    failed = sum(rewritten is None for rewritten in batch)
+    if failed:
+        print(f"⚠ {failed}/{len(job_descs)} jobs missing from the batched response, customizing them one by one")
+    return [splice_sections(sections, rewritten) if rewritten is not None else None for rewritten in batch]
 
 def rebuild_docx(structured_text):
     """Reconstruct DOCX with proper formatting"""
+    from docx import Document
+    from docx.shared import Pt
+
     doc = Document()
     
     # Set default font
@@ -106,54 +337,232 @@ def rebuild_docx(structured_text):
     
     return doc
 
-def process_resumes():
+def output_name(resume_id, job_id):
+    return f"enhanced_{resume_id}_{job_id}.docx"
+
+def fetch_all(table, columns="*", page_size=1000):
+    """Every row of a table, fetched page by page in id order (so no row is
+    skipped or repeated across pages)"""
+    rows = []
+    start = 0
+    while True:
+        res = get_supabase().table(table) \
+            .select(columns) \
+            .order("id") \
+            .range(start, start + page_size - 1) \
+            .execute()
+        rows.extend(res.data)
+        if len(res.data) < page_size:
+            return rows
+        start += page_size
+
+def fetch_resumes(resume_ids, chunk_size=200):
+    """Resume rows for the given ids only"""
+    resume_ids = list(resume_ids)
+    rows = []
+    for start in range(0, len(resume_ids), chunk_size):
+        rows.extend(get_supabase().table("resumes")
+                    .select("*")
+                    .in_("id", resume_ids[start:start + chunk_size])
+                    .execute().data)
+    return rows
+
+def list_existing_outputs(page_size=1000):
+    """Names of customized resumes already in storage, or None if listing fails"""
     try:
-        resumes = supabase.table("resumes").select("*").execute().data
-        jobs = supabase.table("jobs").select("*").execute().data
-        
-        for resume in resumes:
-            if not resume.get('file_url'):
-                continue
-                
-            try:
-                # Download resume
-                response = requests.get(resume['file_url'], timeout=10)
-                file_bytes = io.BytesIO(response.content)
-                
-                # Extract text with structure
-                if resume['file_url'].lower().endswith('.docx'):
-                    doc = Document(file_bytes)
-                    original_text = '\n'.join([p.text for p in doc.paragraphs])
-                else:
-                    original_text = '\n'.join(extract_pdf_structure(file_bytes.getvalue()))
-                
-                for job in jobs:
-                    print(f"🔧 Enhancing resume {resume['id'][:8]} for job {job['id'][:8]}")
-                    
-                    # Customize while preserving structure
-                    customized_text = preserve_structure_customize(original_text, job['description'])
-                    
-                    # Rebuild document
-                    new_doc = rebuild_docx(customized_text)
-                    
-                    # Upload
-                    output = io.BytesIO()
-                    new_doc.save(output)
-                    supabase.storage.from_("customizedresumes").upload(
-                        f"enhanced_{resume['id']}_{job['id']}.docx",
-                        output.getvalue(),
-                        {"content-type": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"}
-                    )
-                    print(f"✅ Structured resume uploaded")
-                    
-                    time.sleep(1.1)
-            
-            except Exception as e:
-                print(f"⚠ Failed to process resume {resume['id']}: {str(e)}")
-                continue
-                
+        bucket = get_supabase().storage.from_(OUTPUT_BUCKET)
+        names = set()
+        offset = 0
+        while True:
+            entries = bucket.list("", {
+                "limit": page_size,
+                "offset": offset,
+                "search": "enhanced_",
+                "sortBy": {"column": "name", "order": "asc"}
+            })
+            names.update(entry["name"] for entry in entries)
+            if len(entries) < page_size:
+                return names
+            offset += page_size
+    except Exception as e:
+        print(f"⚠ Could not list existing customized resumes, regenerating all: {e}")
+        return None
+
+def plan_customizations(resumes, jobs, existing=()):
+    """(resume, [jobs]) work items for real matches only.
+
+    Every job row carries the resume_id it was matched to, so each job is
+    customized for that resume alone; pairs whose output already exists
+    in storage are skipped. Returns (plan, skipped).
+    """
+    jobs_by_resume = {}
+    for job in jobs:
+        if job.get("resume_id") is not None:
+            jobs_by_resume.setdefault(job["resume_id"], []).append(job)
+
+    plan = []
+    skipped = 0
+    for resume in resumes:
+        if not resume.get('file_url'):
+            continue
+        todo = []
+        for job in jobs_by_resume.get(resume["id"], []):
+            if output_name(resume["id"], job["id"]) in existing:
+                skipped += 1
+            else:
+                todo.append(job)
+        if todo:
+            plan.append((resume, todo))
+    return plan, skipped
+
+def download_resume_sections(resume):
+    import requests
+
+    response = requests.get(resume['file_url'], timeout=10)
+    response.raise_for_status()
+    # Extract text with structure (blocks in reading order, cached by content)
+    return parse_document(response.content).sections()
+
+def upload_customized(resume, job, customized_text):
+    # Rebuild document
+    new_doc = rebuild_docx(customized_text)
+
+    # Upload
+    output = io.BytesIO()
+    new_doc.save(output)
+    get_supabase().storage.from_(OUTPUT_BUCKET).upload(
+        output_name(resume['id'], job['id']),
+        output.getvalue(),
+        {"content-type": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"}
+    )
+
+def customize_for_jobs(resume, sections, jobs, use_cache, scheduler):
+    """Customize one resume for a batch of its jobs and upload one DOCX per job.
+
+    Returns [(job, error or None)] so each upload is reported on its own; a
+    job whose customization failed gets no upload, so the next run retries it.
+    """
+    # Boilerplate-free, whitespace-collapsed descriptions keep the prompt compact
+    job_descs = [normalize_description(job['description']) for job in jobs]
+    batch = customize_batch(sections, job_descs, use_cache, scheduler)
+    results = []
+    for job, job_desc, customized_text in zip(jobs, job_descs, batch):
+        try:
+            if customized_text is None:
+                customized_text = customize_sections(sections, job_desc, use_cache, scheduler)
+            upload_customized(resume, job, customized_text)
+            results.append((job, None))
+        except Exception as e:
+            results.append((job, e))
+    return results
+
+def process_resumes(use_cache=True, workers=CUSTOMIZE_WORKERS, scheduler=None, batch_size=JOB_BATCH_SIZE):
+    """Customize every planned (resume, job) pair on a thread pool.
+
+    Each task customizes one resume for up to batch_size of its jobs with a
+    single Gemini request. Gemini calls from all threads go through one
+    LLMScheduler, which keeps them within GEMINI_RPM / GEMINI_TPM and backs
+    off on quota errors.
+    """
+    batch_size = max(1, batch_size)
+    scheduler = scheduler or get_llm_scheduler()
+    try:
+        jobs = fetch_all("jobs", "id,resume_id,description")
+        resumes = fetch_resumes({job["resume_id"] for job in jobs if job.get("resume_id") is not None})
+        existing = list_existing_outputs() or set()
+        plan, skipped = plan_customizations(resumes, jobs, existing)
+        print(f"🗺 {sum(len(todo) for _, todo in plan)} customizations planned for {len(plan)} resumes "
+              f"({len(jobs)} job rows, {skipped} already in storage)")
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Download and parse each resume once
+            sections_by_resume = {}
+            downloads = {pool.submit(download_resume_sections, resume): resume for resume, _ in plan}
+            for future in as_completed(downloads):
+                resume = downloads[future]
+                try:
+                    sections_by_resume[resume['id']] = future.result()
+                except Exception as e:
+                    print(f"⚠ Failed to process resume {resume['id']}: {str(e)}")
+
+            tasks = {}
+            for resume, resume_jobs in plan:
+                if resume['id'] not in sections_by_resume:
+                    continue
+                for start in range(0, len(resume_jobs), batch_size):
+                    batch = resume_jobs[start:start + batch_size]
+                    future = pool.submit(customize_for_jobs, resume, sections_by_resume[resume['id']], batch, use_cache, scheduler)
+                    tasks[future] = (resume, batch)
+
+            done = 0
+            for future in as_completed(tasks):
+                resume, batch = tasks[future]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    results = [(job, e) for job in batch]
+                for job, error in results:
+                    if error is None:
+                        done += 1
+                        print(f"✅ Structured resume uploaded for resume {str(resume['id'])[:8]}, job {str(job['id'])[:8]}")
+                    else:
+                        print(f"⚠ Failed to customize resume {resume['id']} for job {job['id']}: {str(error)}")
+
+        stats = scheduler.stats()
+        print(f"🎯 {done}/{sum(len(batch) for _, batch in tasks.values())} customizations uploaded; "
+              f"{stats['requests']} Gemini requests, "
+              f"{stats['quota_errors']} quota errors")
+
     except Exception as e:
         print(f"💥 Fatal error: {str(e)}")
 
+def print_llm_cache_stats():
+    stats = get_llm_cache().stats()
+    print(f"🧠 LLM cache: {stats['entries']} responses, {stats['bytes'] / 1e6:.1f}/"
+          f"{stats['max_bytes'] / 1e6:.0f} MB, {stats['hits']} hits / {stats['misses']} misses "
+          f"({stats['hit_rate']:.0%}), by prompt version: {stats['versions']}")
+
+def main():
+    global GEMINI_API_ENDPOINT
+    parser = argparse.ArgumentParser(description="Customize resumes for their matched jobs")
+    parser.add_argument("--no-llm-cache", action="store_true",
+                        help="always call Gemini, neither reading nor writing the response cache")
+    parser.add_argument("--invalidate-prompt", metavar="VERSION",
+                        help="drop cached responses generated with this prompt version and exit")
+    parser.add_argument("--prune-prompts", action="store_true",
+                        help=f"drop cached responses of every prompt version but {PROMPT_VERSION} and exit")
+    parser.add_argument("--llm-cache-stats", action="store_true",
+                        help="print response cache statistics and exit")
+    parser.add_argument("--workers", type=int, default=CUSTOMIZE_WORKERS,
+                        help="customizations in flight at once")
+    parser.add_argument("--batch-size", type=int, default=JOB_BATCH_SIZE,
+                        help="jobs customized per Gemini request (1 = one request per job)")
+    parser.add_argument("--rpm", type=int, default=GEMINI_RPM, help="Gemini requests per minute")
+    parser.add_argument("--tpm", type=int, default=GEMINI_TPM, help="Gemini tokens per minute")
+    parser.add_argument("--llm-endpoint", default=GEMINI_API_ENDPOINT,
+                        help="Gemini REST endpoint override, e.g. a local fake_llm.py")
+    args = parser.parse_args()
+    GEMINI_API_ENDPOINT = args.llm_endpoint
+
+    if args.invalidate_prompt or args.prune_prompts:
+        if args.invalidate_prompt:
+            dropped = get_llm_cache().invalidate(prompt_version=args.invalidate_prompt)
+        else:
+            dropped = get_llm_cache().invalidate(keep_version=PROMPT_VERSION)
+        print(f"🗑 Dropped {dropped} cached responses")
+        return
+    if args.llm_cache_stats:
+        print_llm_cache_stats()
+        return
+
+    process_resumes(
+        use_cache=not args.no_llm_cache,
+        workers=args.workers,
+        scheduler=LLMScheduler(args.rpm, args.tpm),
+        batch_size=args.batch_size
+    )
+    if not args.no_llm_cache:
+        print_llm_cache_stats()
+
 if __name__ == "__main__":
-    process_resumes()
+    main()
@@ -0,0 +1,144 @@
+import json
+import logging
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class Daemon:
+    """Runs a unit of work repeatedly in a warm process.
+
+    work() returns how many items it handled. After a productive round the
+    next poll happens after min_interval; every idle round doubles the wait
+    up to max_interval. POST /wake (e.g. from a Supabase database webhook on
+    insert) or SIGUSR1 cuts the wait short. SIGTERM/SIGINT stop polling and
+    let the current round finish before run() returns.
+
+    GET /healthz answers 200 while the loop is alive (a round is running,
+    however long, or the loop woke within max_interval + stall_grace
+    seconds); GET /readyz
+    answers 200 once warm-up finished and until draining starts.
+    """
+
+    def __init__(self, name, work, min_interval=5.0, max_interval=300.0,
+                 health_port=None, stall_grace=600.0):
+        self.name = name
+        self.work = work
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.health_port = health_port
+        self.stall_grace = stall_grace
+        self.interval = min_interval
+        self.ready = False
+        self.rounds = 0
+        self.processed = 0
+        self.last_error = None
+        self.heartbeat = time.monotonic()
+        self.busy = False
+        self.stopping = threading.Event()
+        self._wake = threading.Event()
+        self._server = None
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self, *_):
+        if not self.stopping.is_set():
+            logging.info(f"{self.name}: draining, finishing the current round")
+        self.ready = False
+        self.stopping.set()
+        self._wake.set()
+
+    def healthy(self):
+        # A long drain is not a stall; only the wait between rounds is timed
+        return self.busy or time.monotonic() - self.heartbeat < self.max_interval + self.stall_grace
+
+    def status(self):
+        return {
+            "name": self.name,
+            "ready": self.ready,
+            "healthy": self.healthy(),
+            "busy": self.busy,
+            "draining": self.stopping.is_set(),
+            "rounds": self.rounds,
+            "processed": self.processed,
+            "next_poll_seconds": self.interval,
+            "last_error": self.last_error
+        }
+
+    def _serve_health(self):
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, ok):
+                body = json.dumps(daemon.status()).encode("utf-8")
+                self.send_response(200 if ok else 503)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/healthz":
+                    self._reply(daemon.healthy())
+                elif self.path == "/readyz":
+                    self._reply(daemon.ready)
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                if self.path == "/wake":
+                    daemon.wake()
+                    self._reply(True)
+                else:
+                    self.send_error(404)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("0.0.0.0", self.health_port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        logging.info(f"{self.name}: health endpoint on :{self.health_port}")
+
+    def run(self, warm_up=None):
+        """Poll until SIGTERM/SIGINT; warm_up() runs once before readiness is reported"""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, lambda *_: self.wake())
+        if self.health_port is not None:
+            self._serve_health()
+
+        if warm_up is not None:
+            warm_up()
+        self.ready = True
+        logging.info(f"{self.name}: ready")
+
+        try:
+            while not self.stopping.is_set():
+                self.heartbeat = time.monotonic()
+                self._wake.clear()
+                self.busy = True
+                try:
+                    handled = self.work() or 0
+                    self.last_error = None
+                except Exception as e:
+                    logging.exception(f"{self.name}: round failed")
+                    self.last_error = str(e)
+                    handled = 0
+                finally:
+                    self.busy = False
+                self.rounds += 1
+                self.processed += handled
+                self.heartbeat = time.monotonic()
+
+                if handled:
+                    self.interval = self.min_interval
+                else:
+                    self.interval = min(self.interval * 2, self.max_interval)
+                if self._wake.wait(self.interval) and not self.stopping.is_set():
+                    self.interval = self.min_interval
+        finally:
+            if self._server is not None:
+                self._server.shutdown()
+            logging.info(f"{self.name}: stopped after {self.rounds} rounds, {self.processed} items")
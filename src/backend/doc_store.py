@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import re
+import time
+
+# Sentences of a job description that carry no information about the role
+BOILERPLATE_PATTERNS = re.compile(
+    "|".join([
+        r"equal (employment )?opportunity",
+        r"\beeo\b",
+        r"without regard to",
+        r"reasonable accommodations?",
+        r"affirmative action",
+        r"privacy (policy|notice)",
+        r"e-?verify",
+        r"(click|apply) (here|now)",
+        r"^#li-\w+",
+    ]),
+    re.IGNORECASE
+)
+
+SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+
+def normalize_description(text):
+    """Drop boilerplate sentences from a job description and collapse whitespace.
+
+    Falls back to the whole collapsed text if every sentence looks like
+    boilerplate, so a description is never emptied.
+    """
+    kept = [
+        sentence
+        for line in (text or "").splitlines()
+        for sentence in SENTENCE_BREAK.split(line.strip())
+        if sentence and not BOILERPLATE_PATTERNS.search(sentence)
+    ]
+    return " ".join(" ".join(kept).split()) or " ".join((text or "").split())
+
+def content_hash(normalized):
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+class DocStore:
+    """Parsed job descriptions and their matched skills, keyed by content hash.
+
+    `<hash>.spacy` holds a serialized DocBin of the lowercased normalized
+    text; `<hash>.json` holds the skill set matched against it together with
+    the signature of the skill set it was matched against, so it is only
+    reused while the resume skills are unchanged. The signature covers every
+    resume skill at once, so adding one skill rematches every description
+    (one automaton scan each, cheap next to parsing, which stays cached);
+    keying matches per skill would store every checked skill per entry.
+    Once the files exceed max_bytes the least recently used are deleted.
+    """
+
+    def __init__(self, directory, max_bytes=200 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._size = self.prune()
+
+    def _path(self, normalized, suffix):
+        return os.path.join(self.directory, content_hash(normalized) + suffix)
+
+    def _read(self, path, mode="rb", encoding=None):
+        with open(path, mode, encoding=encoding) as f:
+            data = f.read()
+        os.utime(path)  # Mark as recently used for eviction
+        return data
+
+    def _write(self, path, data):
+        _write_atomic(path, data)
+        self._size += len(data)
+        if self._size > self.max_bytes:
+            self._size = self.prune()
+
+    def load_doc(self, normalized, vocab):
+        from spacy.tokens import DocBin
+
+        try:
+            data = self._read(self._path(normalized, ".spacy"))
+            return next(DocBin().from_bytes(data).get_docs(vocab))
+        except (OSError, ValueError, StopIteration):
+            return None
+
+    def save_doc(self, normalized, doc):
+        from spacy.tokens import DocBin
+
+        self._write(self._path(normalized, ".spacy"), DocBin(docs=[doc]).to_bytes())
+
+    def load_skills(self, normalized, signature):
+        try:
+            entry = json.loads(self._read(self._path(normalized, ".json"), "r", "utf-8"))
+        except (OSError, ValueError):
+            return None
+        return set(entry["skills"]) if entry.get("signature") == signature else None
+
+    def save_skills(self, normalized, signature, skills):
+        entry = {"signature": signature, "skills": sorted(skills)}
+        self._write(self._path(normalized, ".json"), json.dumps(entry).encode("utf-8"))
+
+    def prune(self):
+        """Delete the least recently used files until the rest fit in max_bytes;
+        returns the bytes kept"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+                if entry.name.endswith(".tmp"):
+                    if stat.st_mtime < time.time() - 3600:
+                        os.remove(entry.path)  # Left behind by a crashed writer
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except OSError:
+                continue  # Removed by another process meanwhile
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+        return total
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,353 @@
+"""Document ingestion shared by every stage.
+
+parse_document(content) turns resume bytes into a ParsedDocument: text
+blocks in reading order with their page and a heading flag. It uses the
+fastest available backend for the format and caches the result by content
+hash under DOCUMENT_CACHE_DIR, so extraction, customization and applying
+reuse one parse of each file.
+"""
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import statistics
+import threading
+import time
+import zipfile
+from collections import namedtuple
+from xml.etree import ElementTree
+
+# ✅ Parse cache (bump PARSER_VERSION whenever a backend's blocks change).
+# Entries hold resume text, so the cache is private to its owner and bounded.
+DOCUMENT_CACHE_DIR = ".cache/documents"
+DOCUMENT_CACHE_MAX_BYTES = 200 * 1024 * 1024
+PARSER_VERSION = "2"
+
+# ✅ Backends per format, fastest first; the first one importable is used
+BACKENDS = {
+    "pdf": ["pymupdf", "pdfminer"],
+    "docx": ["ooxml", "python-docx"],
+}
+
+# Short lines at least this much larger than the body text count as headings,
+# as do bold ones naming a usual resume section; bold alone (job titles,
+# employers) does not
+HEADING_SIZE_RATIO = 1.15
+HEADING_MAX_CHARS = 60
+# Section headings a resume's summary and skills go under, which
+# customization rewrites, and every other usual section heading
+EDITABLE_HEADINGS = [
+    r"profile", r"(professional )?summary", r"about( me)?", r"objective", r"(tech(nical)? |key )?skills",
+]
+OTHER_HEADINGS = [
+    r"(work |professional )?experience", r"employment( history)?", r"education", r"projects",
+    r"certifications?", r"awards", r"achievements", r"publications", r"languages", r"interests",
+    r"hobbies", r"contact", r"references", r"volunteer(ing)?", r"get in touch!?",
+]
+
+def heading_pattern(alternatives):
+    """Regex matching a whole line that is one of the heading alternatives"""
+    return re.compile(r"^\W*(" + "|".join(alternatives) + r")\W*$", re.IGNORECASE)
+
+KNOWN_HEADING_PATTERN = heading_pattern(EDITABLE_HEADINGS + OTHER_HEADINGS)
+
+Block = namedtuple("Block", ["text", "page", "is_heading"])
+Section = namedtuple("Section", ["heading", "text"])
+
+class ParsedDocument:
+    """Text blocks of one document in reading order"""
+
+    def __init__(self, file_type, backend, pages, blocks):
+        self.file_type = file_type
+        self.backend = backend
+        self.pages = pages
+        self.blocks = blocks
+
+    @property
+    def text(self):
+        return "\n".join(block.text for block in self.blocks)
+
+    def headings(self):
+        return [block.text for block in self.blocks if block.is_heading]
+
+    def sections(self):
+        """Blocks grouped under the heading before them ('' for text ahead of the first)"""
+        sections = []
+        heading, body = "", []
+        for block in self.blocks:
+            if block.is_heading:
+                if heading or body:
+                    sections.append(Section(heading, "\n".join(body)))
+                heading, body = block.text, []
+            else:
+                body.append(block.text)
+        if heading or body:
+            sections.append(Section(heading, "\n".join(body)))
+        return sections
+
+    def to_dict(self):
+        return {
+            "file_type": self.file_type,
+            "backend": self.backend,
+            "pages": self.pages,
+            "blocks": [list(block) for block in self.blocks]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["file_type"], data["backend"], data["pages"],
+                   [Block(*block) for block in data["blocks"]])
+
+def join_sections(sections):
+    """Text of a document from its sections; join_sections(doc.sections()) == doc.text"""
+    return "\n".join(
+        part for section in sections for part in (section.heading, section.text) if part
+    )
+
+def open_buffer(content):
+    """File-like view of document bytes for parsers that need one.
+
+    The bytes are already in memory, so they are wrapped rather than copied
+    to a temporary file.
+    """
+    return io.BytesIO(content)
+
+def detect_type(content, file_type=None):
+    """'pdf' or 'docx' from the file's magic bytes, falling back to file_type"""
+    if content[:5] == b"%PDF-":
+        return "pdf"
+    if content[:2] == b"PK":
+        return "docx"
+    if file_type:
+        return file_type.lower().lstrip(".")
+    raise ValueError("Unsupported document type")
+
+def looks_like_heading(text):
+    return len(text) < HEADING_MAX_CHARS and text.isupper()
+
+def _parse_pymupdf(content):
+    import fitz  # PyMuPDF
+
+    spans = []
+    with fitz.open(stream=content, filetype="pdf") as doc:
+        pages = doc.page_count
+        for page_no, page in enumerate(doc):
+            for block in page.get_text("dict", sort=True)["blocks"]:
+                if block["type"] != 0:  # Image block
+                    continue
+                lines = []
+                sizes = []
+                bold = True
+                for line in block["lines"]:
+                    lines.append("".join(span["text"] for span in line["spans"]))
+                    for span in line["spans"]:
+                        if span["text"].strip():
+                            sizes.append(span["size"])
+                            bold = bold and bool(span["flags"] & 16)
+                text = "\n".join(lines).strip()
+                if text:
+                    spans.append((text, page_no, max(sizes, default=0), bold))
+
+    body_size = statistics.median([size for _, _, size, _ in spans]) if spans else 0
+    blocks = [
+        Block(text, page_no, looks_like_heading(text) or (
+            len(text) < HEADING_MAX_CHARS and "\n" not in text
+            and (size >= HEADING_SIZE_RATIO * body_size
+                 or (bold and KNOWN_HEADING_PATTERN.match(text) is not None))
+        ))
+        for text, page_no, size, bold in spans
+    ]
+    return pages, blocks
+
+def _parse_pdfminer(content):
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+
+    blocks = []
+    pages = 0
+    with open_buffer(content) as buffer:
+        for page_no, page in enumerate(extract_pages(buffer)):
+            pages += 1
+            for element in page:
+                if isinstance(element, LTTextContainer):
+                    text = element.get_text().strip()
+                    if text:
+                        blocks.append(Block(text, page_no, looks_like_heading(text)))
+    return pages, blocks
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+def _docx_pages(archive):
+    """Page count Word recorded in docProps/app.xml (1 if absent)"""
+    try:
+        root = ElementTree.fromstring(archive.read("docProps/app.xml"))
+    except (KeyError, ElementTree.ParseError):
+        return 1
+    for element in root:
+        if element.tag.endswith("}Pages") and (element.text or "").isdigit():
+            return int(element.text)
+    return 1
+
+def _parse_ooxml(content):
+    """Body paragraphs read straight from word/document.xml"""
+    blocks = []
+    with open_buffer(content) as buffer, zipfile.ZipFile(buffer) as archive:
+        body = ElementTree.fromstring(archive.read("word/document.xml")).find(f"{_W}body")
+        pages = _docx_pages(archive)
+    for para in body.iterfind(f"{_W}p"):
+        parts = []
+        for element in para.iter():
+            if element.tag == f"{_W}t":
+                parts.append(element.text or "")
+            elif element.tag == f"{_W}tab":
+                parts.append("\t")
+            elif element.tag in (f"{_W}br", f"{_W}cr"):
+                parts.append("\n")
+        text = "".join(parts).strip()
+        if not text:
+            continue
+        style = para.find(f"{_W}pPr/{_W}pStyle")
+        style_id = style.get(f"{_W}val", "") if style is not None else ""
+        blocks.append(Block(text, 0, style_id.startswith(("Heading", "Title")) or looks_like_heading(text)))
+    return pages, blocks
+
+def _parse_python_docx(content):
+    from docx import Document
+
+    with open_buffer(content) as buffer:
+        doc = Document(buffer)
+    blocks = []
+    for para in doc.paragraphs:
+        text = para.text.strip()
+        if not text:
+            continue
+        style = para.style.name if para.style is not None else ""
+        blocks.append(Block(text, 0, style.startswith(("Heading", "Title")) or looks_like_heading(text)))
+    return 1, blocks
+
+_PARSERS = {
+    "pymupdf": ("fitz", _parse_pymupdf),
+    "pdfminer": ("pdfminer", _parse_pdfminer),
+    "ooxml": (None, _parse_ooxml),
+    "python-docx": ("docx", _parse_python_docx),
+}
+
+def available_backends(file_type):
+    """Backends for a format whose library is installed, fastest first"""
+    import importlib.util
+
+    return [
+        name for name in BACKENDS.get(file_type, [])
+        if _PARSERS[name][0] is None or importlib.util.find_spec(_PARSERS[name][0]) is not None
+    ]
+
+class DocumentCache:
+    """Parsed documents as gzipped JSON files named by content hash.
+
+    Entries hold resume text, which is personal data: the directory is
+    created 0700 and entries 0600, entries of other PARSER_VERSIONs are
+    deleted, and once the entries exceed max_bytes the least recently used
+    ones are deleted.
+    """
+
+    def __init__(self, directory=DOCUMENT_CACHE_DIR, max_bytes=DOCUMENT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        os.chmod(directory, 0o700)
+        self._lock = threading.Lock()
+        self._size = self.prune()
+
+    def _path(self, content):
+        digest = hashlib.sha256(content).hexdigest()
+        return os.path.join(self.directory, f"{PARSER_VERSION}-{digest}.json.gz")
+
+    def get(self, content):
+        path = self._path(content)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                parsed = ParsedDocument.from_dict(json.load(f))
+            os.utime(path)  # Mark as recently used for eviction
+            return parsed
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, content, parsed):
+        path = self._path(content)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+            f.write(json.dumps(parsed.to_dict()).encode("utf-8"))
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._size += size
+            over = self._size > self.max_bytes
+        if over:
+            size = self.prune()
+            with self._lock:
+                self._size = size
+
+    def prune(self):
+        """Delete entries of other parser versions, then the least recently used
+        ones until the rest fit in max_bytes; returns the bytes kept"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+                if entry.name.endswith(".tmp"):
+                    if stat.st_mtime < time.time() - 3600:
+                        os.remove(entry.path)  # Left behind by a crashed writer
+                elif not entry.name.startswith(f"{PARSER_VERSION}-"):
+                    os.remove(entry.path)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except OSError:
+                continue  # Removed by another process meanwhile
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+        return total
+
+_cache = None
+
+def get_document_cache():
+    global _cache
+    if _cache is None:
+        _cache = DocumentCache()
+    return _cache
+
+def parse_document(content, file_type=None, backend=None, cache=True):
+    """ParsedDocument for document bytes, from the parse cache when possible.
+
+    backend forces one parser (benchmarks); cache=False skips the cache.
+    """
+    cache = get_document_cache() if cache is True else (cache or None)
+    if backend is not None:
+        cache = None
+    if cache is not None:
+        parsed = cache.get(content)
+        if parsed is not None:
+            return parsed
+
+    file_type = detect_type(content, file_type)
+    if backend is None:
+        candidates = available_backends(file_type)
+        if not candidates:
+            raise ValueError(f"No parser installed for {file_type} documents")
+        backend = candidates[0]
+    pages, blocks = _PARSERS[backend][1](content)
+    parsed = ParsedDocument(file_type, backend, pages, blocks)
+
+    if cache is not None:
+        cache.put(content, parsed)
+    return parsed
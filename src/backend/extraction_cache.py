@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from sqlite_lru import SizeBound
+
+class ExtractionCache:
+    """Content-addressed cache of resume extraction results.
+
+    Keyed by SHA-256 of the file bytes plus `version` (taxonomy and model),
+    so re-uploads and exact copies skip text extraction and spaCy entirely,
+    and changing the taxonomy or model invalidates every entry at once;
+    prune() then drops the stale versions. When the stored results exceed
+    max_bytes the least recently used ones are evicted.
+    Hit/miss counters are persisted so rates add up across runs and workers.
+    """
+
+    def __init__(self, path, version, max_bytes=500 * 1024 * 1024):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.version = version
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(results)")}
+        if columns and "used_at" not in columns:
+            # Cache written before entries were sized; it only holds derived data
+            self.conn.execute("DROP TABLE results")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " text TEXT NOT NULL,"
+            " skills TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " used_at REAL NOT NULL"
+            ")"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_used_at ON results (used_at)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        self.conn.commit()
+        self._bound = SizeBound(self.conn, "results", max_bytes)
+
+    def key(self, content):
+        digest = hashlib.sha256(content).hexdigest()
+        return f"{self.version}:{digest}"
+
+    def _count(self, name):
+        self.conn.execute(
+            "INSERT INTO stats (name, value) VALUES (?, 1)"
+            " ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,)
+        )
+
+    def get(self, content):
+        """Return (text, skills) for these file bytes, or None"""
+        key = self.key(content)
+        with self._lock, self.conn:
+            row = self.conn.execute(
+                "SELECT text, skills FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            self._count("hits" if row else "misses")
+            if row is not None:
+                self.conn.execute("UPDATE results SET used_at = ? WHERE key = ?", (time.time(), key))
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def put(self, content, text, skills):
+        skills = json.dumps(skills)
+        size = len(text.encode("utf-8")) + len(skills)
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results (key, text, skills, size, created_at, used_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (self.key(content), text, skills, size, now, now)
+            )
+            self._bound.added(size)
+
+    def prune(self):
+        """Drop entries of every version but this one; returns how many"""
+        with self._lock, self.conn:
+            cur = self.conn.execute(
+                "DELETE FROM results WHERE key NOT LIKE ?", (f"{self.version}:%",)
+            )
+        return cur.rowcount
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.conn.execute("SELECT name, value FROM stats").fetchall())
+            entries, size = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results WHERE key LIKE ?",
+                (f"{self.version}:%",)
+            ).fetchone()
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "version": self.version
+        }
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,155 @@
+"""Local stand-in for the Gemini generateContent REST endpoint.
+
+Enforces its own requests- and tokens-per-minute quota (answering 429
+RESOURCE_EXHAUSTED like the real API) and simulates latency, so the
+customization executor can be tested and benchmarked without spending
+quota. Point customize.py at it with --llm-endpoint http://127.0.0.1:8090.
+
+Run from src/backend: python fake_llm.py --rpm 60 --tpm 100000
+"""
+import argparse
+import collections
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from llm_scheduler import estimate_tokens
+
+RESUME_MARKER = "RESUME (MAKE MINIMAL CHANGES TO THIS EXACT STRUCTURE):"
+SECTIONS_MARKER = "SECTIONS (JSON, heading -> current text):"
+JOBS_MARKER = "JOBS (JSON, key -> job description):"
+INSTRUCTIONS_MARKER = "INSTRUCTIONS:"
+
+def _between(prompt, marker, end_marker=INSTRUCTIONS_MARKER):
+    start = prompt.find(marker)
+    if start < 0:
+        return None
+    start += len(marker)
+    end = prompt.find(end_marker, start)
+    return prompt[start:end if end >= 0 else None].strip()
+
+def fake_completion(prompt):
+    """Echo of what a customization prompt asks to rewrite: the sections JSON
+    (once per job for a batched prompt) or the resume text, unchanged (else
+    the whole prompt)"""
+    sections = _between(prompt, SECTIONS_MARKER)
+    if sections is not None:
+        sections = json.loads(sections)
+        jobs = _between(prompt, JOBS_MARKER, SECTIONS_MARKER)
+        if jobs is not None:
+            return json.dumps({key: sections for key in json.loads(jobs)})
+        return json.dumps(sections)
+    resume = _between(prompt, RESUME_MARKER)
+    return prompt if resume is None else resume
+
+class FakeLLMServer:
+    """Threaded HTTP server answering generateContent requests"""
+
+    def __init__(self, host="127.0.0.1", port=8090, rpm=60, tpm=100000,
+                 latency=1.0, seconds_per_token=0.0, respond=fake_completion):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.latency = latency
+        self.seconds_per_token = seconds_per_token
+        self.respond = respond
+        self.served = 0
+        self.rejected = 0
+        self._window = collections.deque()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://{host}:{self._server.server_address[1]}"
+
+    def _admit(self, tokens):
+        now = time.monotonic()
+        with self._lock:
+            while self._window and self._window[0][0] <= now - 60:
+                self._window.popleft()
+            used = sum(entry[1] for entry in self._window)
+            if len(self._window) >= self.rpm or used + tokens > self.tpm:
+                self.rejected += 1
+                return False
+            self._window.append((now, tokens))
+            self.served += 1
+            return True
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _json(self, status, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                if not self.path.split("?")[0].endswith(":generateContent"):
+                    self._json(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+                    return
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                prompt = "".join(
+                    part.get("text", "")
+                    for content in request.get("contents", [])
+                    for part in content.get("parts", [])
+                )
+                text = server.respond(prompt)
+                prompt_tokens = estimate_tokens(prompt)
+                output_tokens = estimate_tokens(text)
+                if not server._admit(prompt_tokens + output_tokens):
+                    self._json(429, {"error": {
+                        "code": 429,
+                        "message": "Resource has been exhausted (e.g. check quota).",
+                        "status": "RESOURCE_EXHAUSTED"
+                    }})
+                    return
+                time.sleep(server.latency + server.seconds_per_token * output_tokens)
+                self._json(200, {
+                    "candidates": [{
+                        "content": {"parts": [{"text": text}], "role": "model"},
+                        "finishReason": "STOP",
+                        "index": 0
+                    }],
+                    "usageMetadata": {
+                        "promptTokenCount": prompt_tokens,
+                        "candidatesTokenCount": output_tokens,
+                        "totalTokenCount": prompt_tokens + output_tokens
+                    }
+                })
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--rpm", type=int, default=60)
+    parser.add_argument("--tpm", type=int, default=100000)
+    parser.add_argument("--latency", type=float, default=1.0, help="seconds per response")
+    parser.add_argument("--seconds-per-token", type=float, default=0.0, help="extra seconds per output token")
+    args = parser.parse_args()
+
+    server = FakeLLMServer(args.host, args.port, args.rpm, args.tpm, args.latency, args.seconds_per_token)
+    print(f"✅ Fake LLM listening on {server.url} ({args.rpm} RPM, {args.tpm} TPM)")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
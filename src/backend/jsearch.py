@@ -0,0 +1,188 @@
+import asyncio
+import random
+import time
+
+# ✅ JSearch API endpoint
+JSEARCH_HOST = "jsearch.p.rapidapi.com"
+JSEARCH_URL = f"https://{JSEARCH_HOST}/search"
+
+# Status codes worth retrying: rate limited or a transient server error
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def build_query_params(skill, num_pages=1):
+    """JSearch query parameters for a skill (about 10 postings per page)"""
+    return {
+        "query": f"{skill} jobs on LinkedIn",
+        "num_pages": str(num_pages),
+        "page": "1"
+    }
+
+def filter_jobs(jobs, limit=10):
+    """Keep LinkedIn jobs that carry every field the pipeline needs"""
+    # Filter for LinkedIn jobs
+    linkedin_jobs = [
+        job for job in jobs
+        if "linkedin.com" in (job.get("job_apply_link") or "").lower()
+    ]
+
+    # Additional filtering for quality
+    filtered_jobs = []
+    for job in linkedin_jobs[:limit]:
+        # Skip jobs with missing critical information
+        if not all([
+            job.get("job_title"),
+            job.get("employer_name"),
+            job.get("job_description"),
+            job.get("job_apply_link")
+        ]):
+            continue
+
+        # Skip jobs with invalid apply links
+        if job.get("job_apply_link", "").strip() == "#":
+            continue
+
+        filtered_jobs.append(job)
+
+    return filtered_jobs
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second with bursts up to `capacity`"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class AsyncJSearchClient:
+    """Pooled, rate-limited JSearch client.
+
+    One aiohttp session (imported on first use) is shared by every request. `rate`/`burst` should
+    match the RapidAPI plan quota, and `max_concurrency` bounds how many
+    requests are in flight; no retry waits longer than `max_backoff` seconds,
+    whatever Retry-After asks for. Pass `base_url` to point the client at a
+    local HTTP stand-in instead of RapidAPI, and a
+    response_cache.ResponseCache as `cache` to skip queries answered by an
+    earlier run.
+    """
+
+    def __init__(self, api_key, base_url=JSEARCH_URL, rate=1.0, burst=1,
+                 max_concurrency=5, max_retries=4, backoff=1.0, max_backoff=60.0, timeout=30, cache=None):
+        self.base_url = base_url
+        self.headers = {
+            "X-RapidAPI-Key": api_key,
+            "X-RapidAPI-Host": JSEARCH_HOST
+        }
+        self.bucket = TokenBucket(rate, burst)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.cache = cache
+        self._revalidations = []
+        self._session = None
+
+    async def __aenter__(self):
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+        self._session = aiohttp.ClientSession(
+            connector=connector, headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # Let background refreshes of stale cache entries finish first
+        await asyncio.gather(*self._revalidations)
+        await self._session.close()
+
+    def _retry_delay(self, attempt, response=None):
+        """Seconds to wait before a retry, from Retry-After if given, never over max_backoff"""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return min(self.backoff * (2 ** attempt) * (0.5 + random.random()), self.max_backoff)
+
+    async def fetch(self, params, etag=None):
+        """GET the search endpoint, retrying 429/5xx and connection errors with backoff.
+
+        Returns (payload, etag); payload is None when `etag` is still current (304).
+        """
+        import aiohttp
+
+        headers = {"If-None-Match": etag} if etag else None
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            async with self._semaphore:
+                try:
+                    async with self._session.get(self.base_url, params=params, headers=headers) as response:
+                        if response.status == 304:
+                            return None, etag
+                        if response.status in RETRY_STATUSES and attempt < self.max_retries:
+                            delay = self._retry_delay(attempt, response)
+                        else:
+                            response.raise_for_status()
+                            return await response.json(), response.headers.get("ETag")
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if attempt == self.max_retries:
+                        raise
+                    delay = self._retry_delay(attempt)
+            await asyncio.sleep(delay)
+
+    async def _revalidate(self, params, etag):
+        try:
+            payload, etag = await self.fetch(params, etag)
+            if payload is None:
+                self.cache.touch(self.base_url, params)
+            else:
+                self.cache.put(self.base_url, params, payload, etag)
+        except Exception as e:
+            print(f"⚠ Cache revalidation failed: {str(e)}")
+
+    async def fetch_cached(self, params):
+        """Serve from the response cache when possible, refreshing stale entries in the background"""
+        if self.cache is None:
+            payload, _ = await self.fetch(params)
+            return payload
+
+        payload, etag, fresh = self.cache.get(self.base_url, params)
+        if payload is None:
+            payload, etag = await self.fetch(params)
+            self.cache.put(self.base_url, params, payload, etag)
+        elif not fresh:
+            self._revalidations.append(asyncio.create_task(self._revalidate(params, etag)))
+        return payload
+
+    async def search(self, skill, limit=10, num_pages=1):
+        """LinkedIn postings for a skill, from the response cache when possible"""
+        import aiohttp
+
+        try:
+            payload = await self.fetch_cached(build_query_params(skill, num_pages))
+            return filter_jobs(payload.get("data", []), limit)
+        except aiohttp.ClientError as e:
+            print(f"⚠ API request error: {str(e)}")
+            return []
+        except Exception as e:
+            print(f"⚠ Error searching jobs: {str(e)}")
+            return []
+
+    async def search_many(self, skills, limit=10, num_pages=1):
+        """Search every skill concurrently, returning {skill: jobs}"""
+        results = await asyncio.gather(*(self.search(skill, limit, num_pages) for skill in skills))
+        return dict(zip(skills, results))
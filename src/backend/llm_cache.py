@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from sqlite_lru import SizeBound
+
+class LLMResponseCache:
+    """Content-addressed cache of LLM responses, bounded in size.
+
+    Keys hash everything that determines a response (see `key`); each entry
+    also records the prompt version it was generated under, so a template
+    change can drop exactly its entries. When the stored responses exceed
+    max_bytes the least recently used ones are evicted.
+    """
+
+    def __init__(self, path, max_bytes=200 * 1024 * 1024):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " prompt_version TEXT NOT NULL,"
+            " model TEXT NOT NULL,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " used_at REAL NOT NULL"
+            ")"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)")
+        self.conn.commit()
+        self._bound = SizeBound(self.conn, "responses", max_bytes)
+
+    @staticmethod
+    def key(prompt_version, model, generation_config, *inputs):
+        payload = json.dumps([prompt_version, model, generation_config, *inputs], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.conn.execute("UPDATE responses SET used_at = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+
+    def put(self, key, prompt_version, model, response):
+        size = len(response.encode("utf-8"))
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, prompt_version, model, response, size, created_at, used_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, prompt_version, model, response, size, now, now)
+            )
+            self._bound.added(size)
+
+    def delete(self, key):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def invalidate(self, prompt_version=None, keep_version=None):
+        """Drop entries of one prompt version, or of every version but keep_version"""
+        with self._lock, self.conn:
+            if prompt_version is not None:
+                cur = self.conn.execute("DELETE FROM responses WHERE prompt_version = ?", (prompt_version,))
+            else:
+                cur = self.conn.execute("DELETE FROM responses WHERE prompt_version != ?", (keep_version,))
+        return cur.rowcount
+
+    def stats(self):
+        with self._lock:
+            entries, size = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            versions = dict(self.conn.execute(
+                "SELECT prompt_version, COUNT(*) FROM responses GROUP BY prompt_version"
+            ).fetchall())
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "versions": versions
+        }
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,118 @@
+import collections
+import logging
+import random
+import threading
+import time
+
+def estimate_tokens(text):
+    """Rough token count of text (about 4 characters per token)"""
+    return len(text) // 4 + 1
+
+def is_quota_error(e):
+    """Whether an exception is the API refusing a request for quota reasons (HTTP 429)"""
+    if getattr(e, "code", None) == 429 or type(e).__name__ in ("ResourceExhausted", "TooManyRequests"):
+        return True
+    text = str(e)
+    return "429" in text or "RESOURCE_EXHAUSTED" in text or "quota" in text.lower()
+
+class LLMScheduler:
+    """Shares requests-per-minute and tokens-per-minute budgets between threads.
+
+    call(fn, tokens) waits until one more request of `tokens` estimated
+    tokens fits in both budgets over the last `window` seconds, then runs
+    fn(). A quota error pauses every caller for an exponentially growing,
+    jittered delay and retries the call up to max_retries times; requests
+    already in flight when the pause began don't grow it further. The
+    request budget also adapts (AIMD): a quota error cuts it to 90% of what
+    was in the window, and each success raises it by one up to `rpm`.
+    Pass `usage(result)` to replace the estimate with the token count the
+    API actually billed.
+    """
+
+    def __init__(self, rpm, tpm, max_retries=5, backoff=2.0, max_backoff=60.0, window=60.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.window = window
+        self.limit = rpm
+        self.delay = 0.0
+        self.paused_at = 0.0
+        self.paused_until = 0.0
+        self.requests = 0
+        self.quota_errors = 0
+        self._sent = collections.deque()  # [sent_at, tokens] of requests in the window
+        self._cond = threading.Condition()
+
+    def _wait_time(self, tokens, now):
+        while self._sent and self._sent[0][0] <= now - self.window:
+            self._sent.popleft()
+        if now < self.paused_until:
+            return self.paused_until - now
+        used = sum(entry[1] for entry in self._sent)
+        # A request larger than the whole budget still goes out once the window is empty
+        if len(self._sent) < self.limit and (used + tokens <= self.tpm or not self._sent):
+            return 0.0
+        return self._sent[0][0] + self.window - now
+
+    def _acquire(self, tokens):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wait = self._wait_time(tokens, now)
+                if wait <= 0:
+                    entry = [now, tokens]
+                    self._sent.append(entry)
+                    self.requests += 1
+                    return entry
+                self._cond.wait(wait)
+
+    def _on_quota_error(self, sent_at):
+        with self._cond:
+            self.quota_errors += 1
+            if sent_at < self.paused_at:
+                return  # Part of the burst that triggered the current pause
+            now = time.monotonic()
+            self.limit = max(1, int(len(self._sent) * 0.9))
+            self.delay = min(self.max_backoff, max(self.backoff, self.delay * 2))
+            pause = self.delay * (0.5 + random.random())
+            self.paused_at = now
+            self.paused_until = max(self.paused_until, now + pause)
+            self._cond.notify_all()
+        logging.warning(f"LLM quota error, pausing all calls for {pause:.1f}s "
+                        f"and lowering the budget to {self.limit} requests/window")
+
+    def _on_success(self):
+        with self._cond:
+            self.delay /= 2
+            if self.limit < self.rpm:
+                self.limit += 1
+
+    def call(self, fn, tokens, usage=None):
+        for attempt in range(self.max_retries + 1):
+            entry = self._acquire(tokens)
+            try:
+                result = fn()
+            except Exception as e:
+                if not is_quota_error(e) or attempt == self.max_retries:
+                    raise
+                self._on_quota_error(entry[0])
+                continue
+            self._on_success()
+            if usage is not None:
+                actual = usage(result)
+                if actual:
+                    with self._cond:
+                        entry[1] = actual
+                        self._cond.notify_all()
+            return result
+
+    def stats(self):
+        with self._cond:
+            return {
+                "requests": self.requests,
+                "quota_errors": self.quota_errors,
+                "request_limit": self.limit,
+                "backoff_seconds": self.delay
+            }
@@ -0,0 +1,177 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# End-of-stream marker passed between stages
+_DONE = object()
+
+class StageStats:
+    """Thread-safe item counter and active time span of one pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.failed = 0
+        self.first = None
+        self.last = None
+        self._lock = threading.Lock()
+
+    def record(self, started, ok=True):
+        with self._lock:
+            if ok:
+                self.count += 1
+            else:
+                self.failed += 1
+            self.first = started if self.first is None else min(self.first, started)
+            self.last = time.monotonic()
+
+    def report(self):
+        span = (self.last - self.first) if self.first is not None else 0.0
+        rate = self.count / span if span > 0 else 0.0
+        logging.info(f"{self.name}: {self.count} ok, {self.failed} failed, {rate:.1f} items/sec over {span:.1f}s")
+
+def run_pipeline(items, download, extract, write, on_error, download_workers=8,
+                 extract_workers=None, batch_size=50, queue_size=64, worker_init=None,
+                 shortcut=None, pool=None):
+    """Drain items through three stages joined by bounded queues.
+
+    download(item) runs on a thread pool and returns a tuple of arguments
+    for extract(*args), which runs on a process pool (worker_init runs once
+    per worker process, e.g. to load a model). write(batch) receives lists of
+    (item, extract result) of up to batch_size on a single writer thread and
+    may return how many of them it actually wrote (None means all).
+    on_error(item, exc) is called for every item that fails in any stage.
+    shortcut(*args), if given, runs on the download threads; a non-None
+    return value is used as the extract result without visiting the pool.
+    pool, if given, is an already running executor used instead of starting
+    one (and left running), so long-lived callers keep their workers warm;
+    extract_workers should then be the pool's size.
+    Returns the number of items written.
+    """
+    todo = queue.Queue()
+    for item in items:
+        todo.put(item)
+    downloaded = queue.Queue(maxsize=queue_size)
+    extracted = queue.Queue(maxsize=queue_size)
+    stats = {name: StageStats(name) for name in ("download", "shortcut", "extract", "write")}
+    written = 0
+
+    def download_worker():
+        while True:
+            try:
+                item = todo.get_nowait()
+            except queue.Empty:
+                return
+            started = time.monotonic()
+            try:
+                args = download(item)
+            except Exception as e:
+                stats["download"].record(started, ok=False)
+                on_error(item, e)
+                continue
+            stats["download"].record(started)
+
+            if shortcut is not None:
+                started = time.monotonic()
+                try:
+                    result = shortcut(*args)
+                except Exception as e:
+                    logging.warning(f"Shortcut failed, extracting instead: {e}")
+                    result = None
+                if result is not None:
+                    stats["shortcut"].record(started)
+                    extracted.put((item, result))
+                    continue
+            downloaded.put((item, args))
+
+    def write_worker():
+        nonlocal written
+        batch = []
+
+        def flush():
+            nonlocal written
+            if not batch:
+                return
+            started = time.monotonic()
+            try:
+                count = write(list(batch))
+                written += len(batch) if count is None else count
+                for _ in batch:
+                    stats["write"].record(started)
+            except Exception as e:
+                for item, _ in batch:
+                    stats["write"].record(started, ok=False)
+                    on_error(item, e)
+            batch.clear()
+
+        while True:
+            try:
+                entry = extracted.get(timeout=1.0)
+            except queue.Empty:
+                flush()  # Don't hold a partial batch while extraction is slow
+                continue
+            if entry is _DONE:
+                flush()
+                return
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                flush()
+
+    downloaders = [threading.Thread(target=download_worker, daemon=True) for _ in range(download_workers)]
+    for thread in downloaders:
+        thread.start()
+
+    def close_downloads():
+        for thread in downloaders:
+            thread.join()
+        downloaded.put(_DONE)
+
+    threading.Thread(target=close_downloads, daemon=True).start()
+    writer = threading.Thread(target=write_worker, daemon=True)
+    writer.start()
+
+    # Dispatch downloads to the process pool, keeping at most 2 tasks queued per worker
+    extract_workers = extract_workers or os.cpu_count() or 1
+    slots = threading.BoundedSemaphore(2 * extract_workers)
+
+    def collect(item, started, future):
+        try:
+            result = future.result()
+        except Exception as e:
+            stats["extract"].record(started, ok=False)
+            on_error(item, e)
+        else:
+            stats["extract"].record(started)
+            extracted.put((item, result))
+        finally:
+            slots.release()
+
+    def dispatch(pool):
+        while True:
+            entry = downloaded.get()
+            if entry is _DONE:
+                break
+            item, args = entry
+            slots.acquire()
+            started = time.monotonic()
+            future = pool.submit(extract, *args)
+            future.add_done_callback(lambda f, item=item, started=started: collect(item, started, f))
+
+    if pool is not None:
+        dispatch(pool)
+        # Every slot is back once the last in-flight result has been collected
+        for _ in range(2 * extract_workers):
+            slots.acquire()
+    else:
+        with ProcessPoolExecutor(max_workers=extract_workers, initializer=worker_init) as pool:
+            dispatch(pool)
+
+    extracted.put(_DONE)
+    writer.join()
+
+    for stage in stats.values():
+        stage.report()
+    return written
@@ -0,0 +1,83 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+class ResponseCache:
+    """On-disk cache of JSON API responses, stored gzip-compressed.
+
+    Entries are keyed by the endpoint URL plus normalized query parameters.
+    An entry younger than `ttl` seconds is fresh. With `stale_ttl` > 0, an
+    entry up to `ttl + stale_ttl` old is still served (stale-while-revalidate)
+    and the caller is expected to refresh it in the background.
+    """
+
+    def __init__(self, directory, ttl=6 * 3600, stale_ttl=0):
+        self.directory = directory
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def normalize(params):
+        """Canonical form of query parameters: sorted, trimmed, whitespace collapsed"""
+        normalized = {}
+        for name, value in params.items():
+            value = " ".join(str(value).split())
+            normalized[name] = value.lower() if name == "query" else value
+        return dict(sorted(normalized.items()))
+
+    def key(self, url, params):
+        raw = json.dumps([url, self.normalize(params)], separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json.gz")
+
+    def _read(self, key):
+        try:
+            with gzip.open(self._path(key), "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, url, params):
+        """Return (payload, etag, fresh) for a cached response, or (None, None, False)"""
+        entry = self._read(self.key(url, params))
+        if entry is None:
+            return None, None, False
+        age = time.time() - entry["stored_at"]
+        if age < self.ttl:
+            return entry["payload"], entry.get("etag"), True
+        if age < self.ttl + self.stale_ttl:
+            return entry["payload"], entry.get("etag"), False
+        return None, None, False
+
+    def put(self, url, params, payload, etag=None):
+        """Store a response atomically so a crash never leaves a torn entry"""
+        key = self.key(url, params)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {
+            "stored_at": time.time(),
+            "params": self.normalize(params),
+            "etag": etag,
+            "payload": payload
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                f.write(json.dumps(entry).encode("utf-8"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def touch(self, url, params):
+        """Mark an entry fresh again after a 304 Not Modified revalidation"""
+        key = self.key(url, params)
+        entry = self._read(key)
+        if entry is not None:
+            self.put(url, params, entry["payload"], entry.get("etag"))
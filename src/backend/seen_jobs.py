@@ -0,0 +1,62 @@
+import os
+import sqlite3
+
+def job_key(job_link):
+    """Normalized apply link used to recognise a posting across runs"""
+    return (job_link or "").strip()
+
+class SeenJobIndex:
+    """Persistent set of (resume_id, job_link) pairs already stored in the jobs table.
+
+    Backed by a local SQLite file so membership checks stay O(1) lookups on
+    disk without querying Supabase for every fetched posting.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " resume_id TEXT NOT NULL,"
+            " job_link TEXT NOT NULL,"
+            " PRIMARY KEY (resume_id, job_link)"
+            ") WITHOUT ROWID"
+        )
+        self.conn.commit()
+
+    def __contains__(self, pair):
+        resume_id, job_link = pair
+        row = self.conn.execute(
+            "SELECT 1 FROM seen WHERE resume_id = ? AND job_link = ?",
+            (str(resume_id), job_key(job_link))
+        ).fetchone()
+        return row is not None
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def add_many(self, pairs):
+        """Record pairs that are now stored in the jobs table"""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen (resume_id, job_link) VALUES (?, ?)",
+                ((str(resume_id), job_key(job_link)) for resume_id, job_link in pairs)
+            )
+
+    def replace(self, pairs, resume_ids):
+        """Make the index match the jobs table exactly for these resumes (rows
+        deleted upstream are forgotten); pairs are every stored pair of theirs"""
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM seen WHERE resume_id = ?",
+                ((str(resume_id),) for resume_id in resume_ids)
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen (resume_id, job_link) VALUES (?, ?)",
+                ((str(resume_id), job_key(job_link)) for resume_id, job_link in pairs)
+            )
+
+    def close(self):
+        self.conn.close()
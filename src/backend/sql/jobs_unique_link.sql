@@ -0,0 +1,13 @@
+-- Unique (resume_id, job_link) on jobs, so scrape.py can store postings
+-- with upsert(on_conflict="resume_id,job_link", ignore_duplicates=True).
+-- Run once against the Supabase database.
+
+-- Keep the first stored copy of each posting per resume
+delete from jobs a
+ using jobs b
+ where a.resume_id = b.resume_id
+   and a.job_link = b.job_link
+   and a.ctid > b.ctid;
+
+create unique index if not exists jobs_resume_id_job_link_key
+  on jobs (resume_id, job_link);
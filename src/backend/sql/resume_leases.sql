@@ -0,0 +1,120 @@
+-- Lease-based claiming of unprocessed resumes (see work_queue.py).
+-- Run once against the Supabase database, after sql/resume_skills.sql.
+
+alter table resumes
+  add column if not exists processing_state text not null default 'pending',
+  add column if not exists claimed_by text,
+  add column if not exists lease_expires_at timestamptz,
+  add column if not exists attempts int not null default 0;
+
+create index if not exists resumes_claimable_idx
+  on resumes (lease_expires_at)
+  where processed = false;
+
+-- Replaced by the max_attempts version below
+drop function if exists claim_resumes(text, int, int);
+
+-- Atomically claim up to batch_size unprocessed resumes whose lease is free
+-- or expired and that have been claimed fewer than max_attempts times.
+-- SKIP LOCKED lets concurrent workers claim disjoint rows. A resume whose
+-- worker crashed during its last allowed attempt is never failed by anyone,
+-- so its expired lease marks it abandoned first.
+create or replace function claim_resumes(worker_id text, batch_size int, lease_seconds int, max_attempts int)
+returns setof resumes
+language sql
+as $$
+  update resumes
+     set processing_state = 'abandoned',
+         processing_result = jsonb_build_object('error', 'lease expired on the last attempt'),
+         claimed_by = null,
+         lease_expires_at = null
+   where processed = false
+     and processing_state = 'processing'
+     and attempts >= max_attempts
+     and lease_expires_at < now();
+
+  update resumes r
+     set processing_state = 'processing',
+         claimed_by = worker_id,
+         lease_expires_at = now() + make_interval(secs => lease_seconds),
+         attempts = r.attempts + 1
+   where r.id in (
+     select id
+       from resumes
+      where processed = false
+        and attempts < max_attempts
+        and (lease_expires_at is null or lease_expires_at < now())
+      order by id
+      limit batch_size
+        for update skip locked
+   )
+  returning r.*;
+$$;
+
+-- Extend the leases a worker still holds; returns the ids actually renewed.
+create or replace function renew_resume_leases(worker_id text, ids uuid[], lease_seconds int)
+returns setof uuid
+language sql
+as $$
+  update resumes
+     set lease_expires_at = now() + make_interval(secs => lease_seconds)
+   where id = any(ids)
+     and claimed_by = worker_id
+     and processed = false
+  returning id;
+$$;
+
+-- Store skills and mark resumes processed, only while worker_id still holds
+-- an unexpired lease on them, so a worker whose lease lapsed never
+-- overwrites the one that took over. results is
+-- [{"resume_id": ..., "user_id": ..., "skills": [...]}]; skills are upserted
+-- on resume_id (sql/resume_skills.sql). Returns the ids actually completed.
+create or replace function complete_resumes(worker_id text, results jsonb)
+returns setof uuid
+language sql
+as $$
+  with done as (
+    update resumes r
+       set processed = true,
+           processing_state = 'completed',
+           claimed_by = null,
+           lease_expires_at = null,
+           processing_result = jsonb_build_object(
+             'status', 'completed',
+             'skills_count', jsonb_array_length(x.value -> 'skills'))
+      from jsonb_array_elements(results) as x
+     where r.id = (x.value ->> 'resume_id')::uuid
+       and r.claimed_by = worker_id
+       and r.lease_expires_at > now()
+       and r.processed = false
+    returning r.id, x.value
+  ), stored as (
+    insert into resume_skills (resume_id, user_id, skills)
+    select s.resume_id, s.user_id, s.skills
+      from done, jsonb_populate_record(null::resume_skills, done.value) as s
+    on conflict (resume_id) do update
+       set user_id = excluded.user_id,
+           skills = excluded.skills
+  )
+  select id from done;
+$$;
+
+-- Record a failure on a resume worker_id still holds. It becomes claimable
+-- again after retry_seconds, or is abandoned once claimed max_attempts times.
+create or replace function fail_resume(worker_id text, resume_id uuid, error text,
+                                       retry_seconds int, max_attempts int)
+returns setof uuid
+language sql
+as $$
+  update resumes
+     set processing_result = jsonb_build_object('error', error),
+         processing_state = case when attempts >= max_attempts then 'abandoned' else 'failed' end,
+         claimed_by = null,
+         lease_expires_at = case when attempts >= max_attempts then null
+                                 else now() + make_interval(secs => retry_seconds) end
+   where id = resume_id
+     and claimed_by = worker_id
+     and lease_expires_at > now()
+     and processed = false
+  returning id;
+$$;
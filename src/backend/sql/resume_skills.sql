@@ -0,0 +1,12 @@
+-- One resume_skills row per resume, so extraction can upsert on resume_id
+-- and a retried batch replaces its rows instead of duplicating them.
+-- Run once against the Supabase database.
+
+-- Keep only the newest row of each resume
+delete from resume_skills a
+ using resume_skills b
+ where a.resume_id = b.resume_id
+   and a.ctid < b.ctid;
+
+create unique index if not exists resume_skills_resume_id_key
+  on resume_skills (resume_id);
@@ -0,0 +1,40 @@
+"""Size-bounded LRU eviction shared by the SQLite-backed caches.
+
+A table qualifies if it has `key`, `size` (bytes) and `used_at` columns.
+SizeBound keeps a running total of what was added, so puts don't sum the
+whole table; only once the total passes max_bytes is the real size read
+back (other processes may share the file) and the least recently used rows
+deleted.
+"""
+
+def table_size(conn, table):
+    return conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+
+def evict_lru(conn, table, max_bytes):
+    """Delete the least recently used rows until the rest fit in max_bytes;
+    returns the bytes kept"""
+    total = table_size(conn, table)
+    if total <= max_bytes:
+        return total
+    victims = []
+    for key, size in conn.execute(f"SELECT key, size FROM {table} ORDER BY used_at"):
+        if total <= max_bytes:
+            break
+        victims.append((key,))
+        total -= size
+    conn.executemany(f"DELETE FROM {table} WHERE key = ?", victims)
+    return total
+
+class SizeBound:
+    """Running size estimate of one cache table; call added() inside the put's transaction"""
+
+    def __init__(self, conn, table, max_bytes):
+        self.conn = conn
+        self.table = table
+        self.max_bytes = max_bytes
+        self.size = table_size(conn, table)
+
+    def added(self, size):
+        self.size += size
+        if self.size > self.max_bytes:
+            self.size = evict_lru(self.conn, self.table, self.max_bytes)
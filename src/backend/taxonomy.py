@@ -0,0 +1,214 @@
+"""Compiled, versioned skill taxonomy.
+
+The source (skills_taxonomy.json) maps each canonical skill to its aliases.
+Aliases listed under "unsafe_aliases" (short words that often mean
+something else, like "js" in "React JS") are only used to normalize a
+single token already judged to be a skill, never matched in running text.
+"legacy_patterns" are the original case-sensitive matcher patterns, kept
+as the reference extract_skills(mode="legacy") is benchmarked against.
+`python taxonomy.py build` compiles it into a token trie stored as flat
+NumPy arrays under TAXONOMY_DIR/<version>/, which every process maps
+read-only at startup instead of building a PhraseMatcher pattern by pattern.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+
+TAXONOMY_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills_taxonomy.json")
+TAXONOMY_DIR = ".cache/taxonomy"
+
+# Bump when the compiled layout or matching semantics change
+FORMAT_VERSION = "2"
+
+def taxonomy_version(source_path=TAXONOMY_SOURCE):
+    """Hash of the taxonomy source and compiled format; changes invalidate cached results"""
+    with open(source_path, "rb") as f:
+        digest = hashlib.sha256(f.read())
+    digest.update(FORMAT_VERSION.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+def source_terms(source):
+    """{term: canonical skill} for every canonical name and alias in a taxonomy source"""
+    ignore = {skill.lower() for skill in source.get("ignore", [])}
+    terms = {}
+    for canonical, aliases in source["skills"].items():
+        canonical = canonical.lower()
+        if canonical in ignore:
+            continue
+        for term in [canonical, *aliases]:
+            terms.setdefault(" ".join(term.lower().split()), canonical)
+    return terms
+
+def load_legacy_reference(source_path=TAXONOMY_SOURCE):
+    """(patterns, terms) of the original extractor: case-sensitive ORTH patterns
+    and the exact lowercased-text -> canonical skill lookup applied to matches"""
+    with open(source_path, encoding="utf-8") as f:
+        source = json.load(f)
+    return source.get("legacy_patterns", []), source_terms(source)
+
+def build_taxonomy(source_path=TAXONOMY_SOURCE, directory=TAXONOMY_DIR):
+    """Compile the taxonomy source into TAXONOMY_DIR/<version>/ and return that path"""
+    import spacy
+
+    version = taxonomy_version(source_path)
+    target = os.path.join(directory, version)
+    if os.path.exists(os.path.join(target, "meta.json")):
+        return target
+
+    with open(source_path, encoding="utf-8") as f:
+        source = json.load(f)
+    terms = source_terms(source)
+    skills = sorted(set(terms.values()))
+    skill_index = {skill: i for i, skill in enumerate(skills)}
+    unsafe = {alias.lower() for alias in source.get("unsafe_aliases", [])}
+
+    # Token trie keyed on the spaCy LOWER hash of each token; node_safe marks
+    # the terms that may be matched in running text
+    tokenizer = spacy.blank("en")
+    children = [{}]
+    node_skill = [-1]
+    node_safe = [False]
+
+    def insert(tokens, index, safe):
+        node = 0
+        for token in tokens:
+            key = tokenizer.vocab.strings.add(token)
+            child = children[node].get(key)
+            if child is None:
+                child = len(children)
+                children[node][key] = child
+                children.append({})
+                node_skill.append(-1)
+                node_safe.append(False)
+            node = child
+        if node and node_skill[node] < 0:
+            node_skill[node] = index
+            node_safe[node] = safe
+
+    for term, canonical in terms.items():
+        tokens = [token.lower_ for token in tokenizer.make_doc(term)]
+        insert(tokens, skill_index[canonical], term not in unsafe)
+        # "c/c++" also as one token, for tokenizers that don't split it
+        if len(tokens) > 1 and " " not in term:
+            insert([term], skill_index[canonical], term not in unsafe)
+
+    # Flatten to CSR-style arrays: node i's edges are node_edges[i]:node_edges[i + 1]
+    node_edges = [0]
+    edge_keys = []
+    edge_children = []
+    for edges in children:
+        for key in sorted(edges):
+            edge_keys.append(key)
+            edge_children.append(edges[key])
+        node_edges.append(len(edge_keys))
+
+    os.makedirs(directory, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=directory, prefix=".build-")
+    np.save(os.path.join(staging, "node_edges.npy"), np.asarray(node_edges, dtype=np.uint32))
+    np.save(os.path.join(staging, "node_skill.npy"), np.asarray(node_skill, dtype=np.int32))
+    np.save(os.path.join(staging, "node_safe.npy"), np.asarray(node_safe, dtype=np.bool_))
+    np.save(os.path.join(staging, "edge_keys.npy"), np.asarray(edge_keys, dtype=np.uint64))
+    np.save(os.path.join(staging, "edge_children.npy"), np.asarray(edge_children, dtype=np.uint32))
+    with open(os.path.join(staging, "skills.json"), "w", encoding="utf-8") as f:
+        json.dump(skills, f)
+    with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "version": version,
+            "skills": len(skills),
+            "terms": len(terms),
+            "nodes": len(children),
+            "tokenizer": f"spacy.blank('en') {spacy.__version__}"
+        }, f)
+    try:
+        os.rename(staging, target)
+    except OSError:
+        # Another process compiled the same version first
+        shutil.rmtree(staging, ignore_errors=True)
+    return target
+
+class Taxonomy:
+    """Compiled taxonomy mapped read-only from disk"""
+
+    def __init__(self, path):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        with open(os.path.join(path, "skills.json"), encoding="utf-8") as f:
+            self.skills = json.load(f)
+        self.version = self.meta["version"]
+        self.node_edges = np.load(os.path.join(path, "node_edges.npy"), mmap_mode="r")
+        self.node_skill = np.load(os.path.join(path, "node_skill.npy"), mmap_mode="r")
+        self.node_safe = np.load(os.path.join(path, "node_safe.npy"), mmap_mode="r")
+        self.edge_keys = np.load(os.path.join(path, "edge_keys.npy"), mmap_mode="r")
+        self.edge_children = np.load(os.path.join(path, "edge_children.npy"), mmap_mode="r")
+        self.root_keys = np.asarray(self.edge_keys[self.node_edges[0]:self.node_edges[1]])
+
+    def _child(self, node, key):
+        lo, hi = int(self.node_edges[node]), int(self.node_edges[node + 1])
+        i = lo + int(np.searchsorted(self.edge_keys[lo:hi], key))
+        if i < hi and self.edge_keys[i] == key:
+            return int(self.edge_children[i])
+        return -1
+
+    def match(self, doc):
+        """(skill, start, end) for the leftmost-longest, non-overlapping term
+        occurrences in a doc, compared on LOWER; unsafe aliases are skipped,
+        so "React JS" is react alone and "C/C++" is c++ alone"""
+        from spacy.attrs import LOWER
+
+        keys = doc.to_array(LOWER)
+        matches = []
+        covered = 0
+        for start in np.flatnonzero(np.isin(keys, self.root_keys)).tolist():
+            if start < covered:
+                continue
+            node = 0
+            longest = None
+            for end in range(start, len(keys)):
+                node = self._child(node, keys[end])
+                if node < 0:
+                    break
+                skill = int(self.node_skill[node])
+                if skill >= 0 and self.node_safe[node]:
+                    longest = (self.skills[skill], start, end + 1)
+            if longest is not None:
+                matches.append(longest)
+                covered = longest[2]
+        return matches
+
+    def skills_in(self, doc):
+        """Canonical skills mentioned anywhere in a doc"""
+        return {skill for skill, _, _ in self.match(doc)}
+
+    def canonical_token(self, lower_key):
+        """Canonical skill for a single token's LOWER hash, or None"""
+        node = self._child(0, lower_key)
+        if node < 0 or self.node_skill[node] < 0:
+            return None
+        return self.skills[int(self.node_skill[node])]
+
+def load_taxonomy(source_path=TAXONOMY_SOURCE, directory=TAXONOMY_DIR):
+    """Map the compiled taxonomy for the current source, compiling it first if needed"""
+    path = os.path.join(directory, taxonomy_version(source_path))
+    if not os.path.exists(os.path.join(path, "meta.json")):
+        path = build_taxonomy(source_path, directory)
+    return Taxonomy(path)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="compile the taxonomy source")
+    build.add_argument("--source", default=TAXONOMY_SOURCE)
+    build.add_argument("--out", default=TAXONOMY_DIR)
+    args = parser.parse_args()
+
+    path = build_taxonomy(args.source, args.out)
+    meta = Taxonomy(path).meta
+    print(f"✅ Taxonomy {meta['version']}: {meta['skills']} skills, {meta['terms']} terms, "
+          f"{meta['nodes']} trie nodes -> {path}")
+
+if __name__ == "__main__":
+    main()
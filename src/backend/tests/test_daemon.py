@@ -0,0 +1,22 @@
+import time
+
+from daemon import Daemon
+
+def test_healthy_during_a_round_longer_than_the_stall_window():
+    seen = []
+
+    def work():
+        time.sleep(0.1)  # Outlasts max_interval + stall_grace
+        seen.append(daemon.healthy())
+        daemon.stop()
+        return 1
+
+    daemon = Daemon("test", work, min_interval=0.01, max_interval=0.02, stall_grace=0.02)
+    daemon.run()
+    assert seen == [True]
+    assert not daemon.busy
+
+def test_unhealthy_when_the_loop_stalls_between_rounds():
+    daemon = Daemon("test", lambda: 0, max_interval=0.02, stall_grace=0.02)
+    daemon.heartbeat -= 1
+    assert not daemon.healthy()
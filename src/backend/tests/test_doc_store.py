@@ -0,0 +1,26 @@
+import os
+
+from doc_store import DocStore, normalize_description
+
+def test_drops_only_the_boilerplate_sentence():
+    text = "Senior Python developer needed. Django, AWS required. We are an equal opportunity employer."
+    assert normalize_description(text) == "Senior Python developer needed. Django, AWS required."
+
+def test_drops_boilerplate_lines():
+    text = "Build data pipelines.\n\nEEO statement: we hire without regard to race.\n#LI-Remote"
+    assert normalize_description(text) == "Build data pipelines."
+
+def test_keeps_text_when_everything_looks_like_boilerplate():
+    text = "We are an  equal opportunity employer."
+    assert normalize_description(text) == "We are an equal opportunity employer."
+
+def test_store_evicts_least_recently_used(tmp_path):
+    store = DocStore(str(tmp_path), max_bytes=300)
+    for i in range(3):
+        store.save_skills(f"job {i}", "sig", {f"skill{i}" * 10})
+        os.utime(store._path(f"job {i}", ".json"), (i, i))
+    assert store.load_skills("job 0", "sig") == {"skill0" * 10}  # Now the most recent
+    store.save_skills("job 3", "sig", {"skill3" * 10})
+    assert store.load_skills("job 1", "sig") is None
+    assert store.load_skills("job 0", "sig") == {"skill0" * 10}
+    assert store.load_skills("job 3", "sig") == {"skill3" * 10}
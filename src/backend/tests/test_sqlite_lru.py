@@ -0,0 +1,22 @@
+from extraction_cache import ExtractionCache
+from llm_cache import LLMResponseCache
+
+def test_extraction_cache_evicts_least_recently_used(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "extraction.sqlite3"), "v1", max_bytes=250)
+    cache.put(b"a", "x" * 100, ["python"])
+    cache.put(b"b", "y" * 100, ["go"])
+    assert cache.get(b"a") is not None  # b is now the least recently used
+    cache.put(b"c", "z" * 100, [])
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") is not None and cache.get(b"c") is not None
+
+def test_size_survives_reopening(tmp_path):
+    path = str(tmp_path / "llm.sqlite3")
+    cache = LLMResponseCache(path, max_bytes=25)
+    cache.put("k1", "1", "model", "r" * 10)
+    cache.put("k2", "1", "model", "r" * 10)
+    cache.close()
+    cache = LLMResponseCache(path, max_bytes=25)
+    cache.put("k3", "1", "model", "r" * 10)
+    assert cache.get("k1") is None
+    assert cache.stats()["bytes"] == 20
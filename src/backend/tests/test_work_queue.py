@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from work_queue import LeaseKeeper, SqliteLeaseBackend
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+@pytest.fixture
+def backend(tmp_path, clock):
+    backend = SqliteLeaseBackend(str(tmp_path / "leases.sqlite3"), clock=clock)
+    backend.add([{"id": f"r{i}", "user_id": "u1"} for i in range(6)])
+    return backend
+
+def result(row_id, skills=("python",)):
+    return {"resume_id": row_id, "user_id": "u1", "skills": list(skills)}
+
+def test_workers_claim_disjoint_rows(backend):
+    a = {row["id"] for row in backend.claim("a", 4, 60, 5)}
+    b = {row["id"] for row in backend.claim("b", 4, 60, 5)}
+    assert len(a) == 4 and len(b) == 2
+    assert not a & b
+    assert backend.claim("c", 4, 60, 5) == []
+
+def test_expired_lease_is_reclaimed(backend, clock):
+    backend.claim("a", 6, 60, 5)
+    clock.now += 61
+    reclaimed = {row["id"] for row in backend.claim("b", 6, 60, 5)}
+    assert len(reclaimed) == 6
+    assert backend.state("r0") == ("processing", 2, "b")
+
+def test_stale_worker_cannot_complete(backend, clock):
+    backend.claim("a", 1, 60, 5)
+    clock.now += 61
+    backend.claim("b", 1, 60, 5)
+    assert backend.complete("a", [result("r0")]) == set()
+    assert backend.fail("a", "r0", "boom", 3600, 5) is False
+    assert backend.complete("b", [result("r0")]) == {"r0"}
+    assert backend.state("r0") == ("completed", 2, None)
+
+def test_expired_lease_without_reclaim_cannot_complete(backend, clock):
+    backend.claim("a", 1, 60, 5)
+    clock.now += 61
+    assert backend.complete("a", [result("r0")]) == set()
+
+def test_fail_abandons_after_max_attempts(backend, clock):
+    for _ in range(2):
+        backend.claim("a", 1, 60, 2)
+        assert backend.fail("a", "r0", "boom", 10, 2)
+        clock.now += 11
+    assert backend.state("r0")[0] == "abandoned"
+    assert "r0" not in {row["id"] for row in backend.claim("a", 6, 60, 2)}
+
+def test_crash_on_last_attempt_is_abandoned(backend, clock):
+    backend.claim("a", 1, 60, 1)
+    clock.now += 61
+    assert "r0" not in {row["id"] for row in backend.claim("b", 6, 60, 1)}
+    assert backend.state("r0") == ("abandoned", 1, None)
+
+def test_keeper_reports_lost_lease(backend, clock):
+    backend.claim("a", 1, 0.3, 5)
+    clock.now += 1
+    backend.claim("b", 1, 60, 5)
+    keeper = LeaseKeeper(backend, "a", 0.3).start()
+    try:
+        keeper.hold({"r0"})
+        deadline = time.monotonic() + 5
+        while not keeper.is_lost("r0") and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert keeper.is_lost("r0")
+        assert "r0" not in keeper.held
+    finally:
+        keeper.stop()
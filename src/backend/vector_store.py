@@ -0,0 +1,125 @@
+"""Static word vectors shared read-only between processes.
+
+`python vector_store.py export en_core_web_md` writes a model's vector
+table once to VECTORS_DIR/<model>-<version>-v<EXPORT_FORMAT>/ as flat
+NumPy arrays, including its key -> row map, so workers bulk-load the map
+instead of adding half a million keys one at a time.
+load_shared_model() then loads the pipeline without its own copy of the
+table and maps the exported one with mmap_mode="r", so every worker on a
+machine reads the same page-cache pages instead of holding a private copy.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+from importlib.metadata import version as package_version
+import numpy as np
+
+VECTORS_DIR = ".cache/vectors"
+# Bump when the export layout changes; older exports are then ignored
+EXPORT_FORMAT = "2"
+
+def vectors_path(model, directory=VECTORS_DIR):
+    """Export directory for an installed model package"""
+    return os.path.join(directory, f"{model}-{package_version(model)}-v{EXPORT_FORMAT}")
+
+def export_vectors(nlp, path):
+    """Write nlp's vector table (plus a unit-normalized copy) to path and return path"""
+    if os.path.exists(os.path.join(path, "meta.json")):
+        return path
+    vectors = nlp.vocab.vectors
+    # Only plain key -> row tables can be shared; floret tables are hashed per subword
+    shareable = vectors.mode == "default" and vectors.shape[0] > 0
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=directory, prefix=".export-")
+    meta = {"name": vectors.name, "rows": 0, "width": 0, "keys": 0}
+    if shareable:
+        data = np.ascontiguousarray(np.asarray(vectors.data), dtype=np.float32)
+        norms = np.linalg.norm(data, axis=1, keepdims=True)
+        unit = np.divide(data, norms, out=np.zeros_like(data), where=norms > 0)
+        key2row = vectors.key2row
+        np.save(os.path.join(staging, "data.npy"), data)
+        np.save(os.path.join(staging, "unit.npy"), unit)
+        pairs = np.empty((len(key2row), 2), dtype=np.uint64)
+        pairs[:, 0] = np.fromiter(key2row.keys(), dtype=np.uint64, count=len(key2row))
+        pairs[:, 1] = np.fromiter(key2row.values(), dtype=np.uint64, count=len(key2row))
+        np.save(os.path.join(staging, "key2row.npy"), pairs)
+        meta.update(rows=data.shape[0], width=data.shape[1], keys=len(key2row))
+    with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    try:
+        os.rename(staging, path)
+    except OSError:
+        # Another process exported the same model first
+        shutil.rmtree(staging, ignore_errors=True)
+    return path
+
+def read_meta(path):
+    try:
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except OSError:
+        return None
+
+def attach_vectors(vocab, path):
+    """Replace vocab's vector table with the read-only mapped export at path"""
+    from spacy.vectors import Vectors
+
+    meta = read_meta(path)
+    vectors = Vectors(data=np.load(os.path.join(path, "data.npy"), mmap_mode="r"), name=meta["name"])
+    # Every row is already in use, so the map can be set wholesale rather than through add()
+    pairs = np.load(os.path.join(path, "key2row.npy"))
+    vectors.key2row = dict(zip(pairs[:, 0].tolist(), pairs[:, 1].tolist()))
+    vocab.vectors = vectors
+    return vectors
+
+def load_unit_vectors(model, directory=VECTORS_DIR):
+    """Unit-normalized vector table of an exported model, mapped read-only, or None"""
+    path = vectors_path(model, directory)
+    meta = read_meta(path)
+    if not meta or not meta["rows"]:
+        return None
+    return np.load(os.path.join(path, "unit.npy"), mmap_mode="r")
+
+def load_shared_model(model, directory=VECTORS_DIR, exclude=()):
+    """spacy.load(model) whose static vectors are mapped from the shared export.
+
+    The first process to load a model exports its vectors. Models without
+    static vectors (e.g. en_core_web_sm) load normally.
+    """
+    import spacy
+
+    path = vectors_path(model, directory)
+    meta = read_meta(path)
+    if meta is None:
+        nlp = spacy.load(model, exclude=list(exclude))
+        meta = read_meta(export_vectors(nlp, path))
+        if meta["rows"]:
+            # Drop this process's private copy too
+            attach_vectors(nlp.vocab, path)
+        return nlp
+    if not meta["rows"]:
+        return spacy.load(model, exclude=list(exclude))
+    nlp = spacy.load(model, exclude=["vectors", *exclude])
+    attach_vectors(nlp.vocab, path)
+    return nlp
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="export a model's vector table for sharing")
+    export.add_argument("model", help="installed spaCy model package, e.g. en_core_web_md")
+    export.add_argument("--out", default=VECTORS_DIR)
+    args = parser.parse_args()
+
+    import spacy
+
+    path = export_vectors(spacy.load(args.model), vectors_path(args.model, args.out))
+    meta = read_meta(path)
+    print(f"✅ {args.model}: {meta['rows']} x {meta['width']} vectors, {meta['keys']} keys -> {path}")
+
+if __name__ == "__main__":
+    main()
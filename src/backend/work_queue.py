@@ -0,0 +1,260 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+def make_worker_id():
+    """Identifier unique to this worker process across nodes"""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+class SupabaseLeaseBackend:
+    """Claims resumes through the Postgres functions in sql/resume_leases.sql"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def claim(self, worker_id, batch_size, lease_seconds, max_attempts):
+        res = self.client.rpc("claim_resumes", {
+            "worker_id": worker_id,
+            "batch_size": batch_size,
+            "lease_seconds": lease_seconds,
+            "max_attempts": max_attempts
+        }).execute()
+        return res.data or []
+
+    def renew(self, worker_id, ids, lease_seconds):
+        res = self.client.rpc("renew_resume_leases", {
+            "worker_id": worker_id,
+            "ids": list(ids),
+            "lease_seconds": lease_seconds
+        }).execute()
+        return {row if isinstance(row, str) else row["renew_resume_leases"] for row in res.data or []}
+
+    def complete(self, worker_id, results):
+        """Store skills and mark resumes processed, but only those whose lease
+        worker_id still holds, in one statement.
+
+        results is a list of {"resume_id", "user_id", "skills"}; returns the
+        ids actually completed.
+        """
+        res = self.client.rpc("complete_resumes", {
+            "worker_id": worker_id,
+            "results": results
+        }).execute()
+        return {row if isinstance(row, str) else row["complete_resumes"] for row in res.data or []}
+
+    def fail(self, worker_id, row_id, error, retry_seconds, max_attempts):
+        """Record a failure on a resume whose lease worker_id still holds.
+
+        The resume becomes claimable again after retry_seconds, unless it has
+        been claimed max_attempts times, in which case it is abandoned.
+        Returns whether the lease was still held.
+        """
+        res = self.client.rpc("fail_resume", {
+            "worker_id": worker_id,
+            "resume_id": row_id,
+            "error": error,
+            "retry_seconds": retry_seconds,
+            "max_attempts": max_attempts
+        }).execute()
+        return bool(res.data)
+
+class SqliteLeaseBackend:
+    """Local stand-in for the Supabase backend with the same claim semantics.
+
+    Rows live in a `resumes` table holding the lease columns plus the row
+    itself as JSON, and completed skills in `resume_skills`; BEGIN IMMEDIATE
+    makes each call atomic across processes. clock replaces time.time in tests.
+    """
+
+    def __init__(self, path, clock=time.time):
+        self.clock = clock
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            " id TEXT PRIMARY KEY,"
+            " processed INTEGER NOT NULL DEFAULT 0,"
+            " processing_state TEXT NOT NULL DEFAULT 'pending',"
+            " processing_result TEXT,"
+            " claimed_by TEXT,"
+            " lease_expires_at REAL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " row TEXT NOT NULL"
+            ")"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS resume_skills ("
+            " resume_id TEXT PRIMARY KEY,"
+            " user_id TEXT,"
+            " skills TEXT NOT NULL"
+            ")"
+        )
+
+    def _transaction(self, work):
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(self.clock())
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return result
+
+    def add(self, rows):
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO resumes (id, row) VALUES (?, ?)",
+                ((str(row["id"]), json.dumps(row)) for row in rows)
+            )
+
+    def state(self, row_id):
+        """(processing_state, attempts, claimed_by) of one row"""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT processing_state, attempts, claimed_by FROM resumes WHERE id = ?", (str(row_id),)
+            ).fetchone()
+
+    def claim(self, worker_id, batch_size, lease_seconds, max_attempts):
+        def work(now):
+            # Crashed on the last allowed attempt: nobody will ever fail it
+            self.conn.execute(
+                "UPDATE resumes SET processing_state = 'abandoned', claimed_by = NULL,"
+                " lease_expires_at = NULL, processing_result = ?"
+                " WHERE processed = 0 AND processing_state = 'processing'"
+                " AND attempts >= ? AND lease_expires_at < ?",
+                (json.dumps({"error": "lease expired on the last attempt"}), max_attempts, now)
+            )
+            rows = self.conn.execute(
+                "SELECT id, row FROM resumes WHERE processed = 0 AND attempts < ?"
+                " AND (lease_expires_at IS NULL OR lease_expires_at < ?)"
+                " ORDER BY id LIMIT ?",
+                (max_attempts, now, batch_size)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE resumes SET processing_state = 'processing', claimed_by = ?,"
+                " lease_expires_at = ?, attempts = attempts + 1 WHERE id = ?",
+                ((worker_id, now + lease_seconds, row_id) for row_id, _ in rows)
+            )
+            return [json.loads(row) for _, row in rows]
+
+        return self._transaction(work)
+
+    def _held(self, worker_id, row_id, now):
+        return self.conn.execute(
+            "SELECT 1 FROM resumes WHERE id = ? AND claimed_by = ? AND lease_expires_at > ?"
+            " AND processed = 0",
+            (str(row_id), worker_id, now)
+        ).fetchone() is not None
+
+    def renew(self, worker_id, ids, lease_seconds):
+        def work(now):
+            renewed = set()
+            for row_id in ids:
+                cur = self.conn.execute(
+                    "UPDATE resumes SET lease_expires_at = ?"
+                    " WHERE id = ? AND claimed_by = ? AND processed = 0",
+                    (now + lease_seconds, str(row_id), worker_id)
+                )
+                if cur.rowcount:
+                    renewed.add(str(row_id))
+            return renewed
+
+        return self._transaction(work)
+
+    def complete(self, worker_id, results):
+        def work(now):
+            completed = set()
+            for result in results:
+                row_id = str(result["resume_id"])
+                if not self._held(worker_id, row_id, now):
+                    continue
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO resume_skills (resume_id, user_id, skills) VALUES (?, ?, ?)",
+                    (row_id, result["user_id"], json.dumps(result["skills"]))
+                )
+                self.conn.execute(
+                    "UPDATE resumes SET processed = 1, processing_state = 'completed',"
+                    " claimed_by = NULL, lease_expires_at = NULL, processing_result = ? WHERE id = ?",
+                    (json.dumps({"status": "completed", "skills_count": len(result["skills"])}), row_id)
+                )
+                completed.add(row_id)
+            return completed
+
+        return self._transaction(work)
+
+    def fail(self, worker_id, row_id, error, retry_seconds, max_attempts):
+        def work(now):
+            if not self._held(worker_id, row_id, now):
+                return False
+            self.conn.execute(
+                "UPDATE resumes SET processing_result = ?, claimed_by = NULL,"
+                " processing_state = CASE WHEN attempts >= ? THEN 'abandoned' ELSE 'failed' END,"
+                " lease_expires_at = CASE WHEN attempts >= ? THEN NULL ELSE ? END WHERE id = ?",
+                (json.dumps({"error": error}), max_attempts, max_attempts, now + retry_seconds, str(row_id))
+            )
+            return True
+
+        return self._transaction(work)
+
+class LeaseKeeper:
+    """Background thread that keeps renewing the leases a worker holds.
+
+    Renews every lease_seconds / 3; ids whose lease could not be renewed
+    (expired and reclaimed by another worker) are dropped and reported, and
+    is_lost() tells writers to discard their results.
+    """
+
+    def __init__(self, backend, worker_id, lease_seconds):
+        self.backend = backend
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.held = set()
+        self.lost = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def hold(self, ids):
+        with self._lock:
+            self.held.update(ids)
+
+    def drop(self, ids):
+        with self._lock:
+            self.held.difference_update(ids)
+            self.lost.difference_update(ids)
+
+    def is_lost(self, row_id):
+        with self._lock:
+            return str(row_id) in self.lost
+
+    def _run(self):
+        while not self._stop.wait(self.lease_seconds / 3):
+            with self._lock:
+                ids = set(self.held)
+            if not ids:
+                continue
+            try:
+                renewed = self.backend.renew(self.worker_id, ids, self.lease_seconds)
+            except Exception as e:
+                logging.warning(f"Lease renewal failed: {e}")
+                continue
+            lost = ids - {str(row_id) for row_id in renewed}
+            if lost:
+                logging.warning(f"Lost leases on {len(lost)} resumes: {sorted(lost)}")
+                with self._lock:
+                    self.held.difference_update(lost)
+                    self.lost.update(lost)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()